@@ -0,0 +1,222 @@
+import argparse
+import os
+import sys
+
+parser = argparse.ArgumentParser(description="Generate many CVs in parallel.")
+parser.add_argument(
+    "data",
+    nargs="+",
+    help="Data files, glob patterns or directories containing data files. With --archive, JSON Lines files with one CV per line, or - for stdin.",
+)
+parser.add_argument(
+    "--lang", "-l", dest="lang", default="en", help="Language of the CVs."
+)
+parser.add_argument(
+    "--output", "-o", dest="output", default="./", help="Directory to save CVs in."
+)
+parser.add_argument(
+    "--archive",
+    "-a",
+    dest="archive",
+    help="Write the CVs into this ZIP or TAR file instead, or - for stdout.",
+)
+parser.add_argument(
+    "--format",
+    dest="archive_format",
+    help="Format of the archive, zip, tar or tar.gz, defaults to its extension.",
+)
+parser.add_argument(
+    "--manifest",
+    dest="manifest",
+    help="File to write the result of every record to, defaults to the archive's name with .manifest.jsonl.",
+)
+parser.add_argument(
+    "--data-dir",
+    "-d",
+    dest="data_dir",
+    default="./",
+    help="Directory that images referenced by records are resolved against.",
+)
+parser.add_argument(
+    "--workers",
+    "-w",
+    dest="workers",
+    type=int,
+    default=None,
+    help="Number of worker processes, defaults to the number of CPUs.",
+)
+parser.add_argument(
+    "--image-cache-size",
+    dest="image_cache_size",
+    type=int,
+    default=None,
+    help="Size budget of the portrait cache in MB.",
+)
+parser.add_argument(
+    "--font",
+    dest="font",
+    default="SourceSansPro-Regular",
+    help="Name of a font in assets/Source_Sans_Pro or path to a TTF file.",
+)
+parser.add_argument(
+    "--catalog",
+    dest="catalogs",
+    action="append",
+    default=[],
+    help="JSON file with additional or overridden strings, can be repeated.",
+)
+parser.add_argument(
+    "--template",
+    dest="template",
+    help="JSON layout template to use, defaults to assets/templates/default.json.",
+)
+parser.add_argument(
+    "--deterministic",
+    dest="deterministic",
+    action="store_true",
+    help="Produce the same bytes for the same inputs, dates come from SOURCE_DATE_EPOCH if set.",
+)
+parser.add_argument(
+    "--build-manifest",
+    dest="build_manifest",
+    help="Directory to record the inputs of rendered CVs in, CVs whose inputs are unchanged are skipped.",
+)
+parser.add_argument(
+    "--cache-dir",
+    dest="cache_dir",
+    help="Directory for converted fonts and prepared images, defaults to $CV_GENERATOR_CACHE or __cache__.",
+)
+parser.add_argument(
+    "--hide-watermark",
+    "-hd",
+    dest="watermark",
+    action="store_false",
+    help="Hide the watermark.",
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    # Deferred as in main.py, rendering isn't needed to parse the arguments.
+    from cv_generator.batch import (
+        BatchSummary,
+        collect_data_files,
+        generate_cvs,
+        generate_cvs_from_records,
+        iter_records,
+    )
+    from cv_generator.util.archive import (
+        archive_formats,
+        get_archive_format,
+        open_archive,
+    )
+    from cv_generator.layout import load_template
+    from cv_generator.main import use_binary_streams
+    from cv_generator.util.file_cache import set_cache_root
+    from cv_generator.util.i18n import load_catalog
+
+    use_binary_streams()
+
+    if args.cache_dir:
+        set_cache_root(args.cache_dir)
+
+    # Loaded before the workers are forked, which inherit the strings and the
+    # compiled template.
+    for catalog_path in args.catalogs:
+        load_catalog(catalog_path)
+    try:
+        load_template(args.template)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f"Invalid template: {e}")
+
+    image_cache_size = (
+        args.image_cache_size * 1024**2 if args.image_cache_size else None
+    )
+    summary = BatchSummary()
+
+    if args.archive:
+        if args.build_manifest:
+            parser.error("--build-manifest only applies to data files")
+        if args.archive == "-" and not args.archive_format:
+            parser.error("--format is required when writing to stdout")
+        try:
+            archive_format = args.archive_format or get_archive_format(args.archive)
+        except ValueError as e:
+            parser.error(str(e))
+        if archive_format not in archive_formats:
+            parser.error(f"Unknown archive format: {archive_format}")
+        manifest_path = args.manifest or (
+            "manifest.jsonl"
+            if args.archive == "-"
+            else f"{args.archive}.manifest.jsonl"
+        )
+        # Progress goes to stderr so it doesn't end up in the archive.
+        log = sys.stderr if args.archive == "-" else sys.stdout
+
+        def records():
+            for path in args.data:
+                if path == "-":
+                    yield from iter_records(sys.stdin, "<stdin>")
+                    continue
+                with open(path, encoding="utf8") as f:
+                    yield from iter_records(f, path)
+
+        with open(manifest_path, "w", encoding="utf8") as manifest, (
+            sys.stdout.buffer if args.archive == "-" else open(args.archive, "wb")
+        ) as fileobj, open_archive(fileobj, archive_format) as archive:
+            for result in generate_cvs_from_records(
+                records(),
+                archive,
+                args.font,
+                args.lang,
+                args.data_dir,
+                args.watermark,
+                args.workers,
+                image_cache_size=image_cache_size,
+                manifest=manifest,
+                deterministic=args.deterministic,
+                template=args.template,
+            ):
+                summary.add(result)
+                if result.ok:
+                    print(f"[{summary.count}] {result.filename}", file=log)
+                else:
+                    print(
+                        f"[{summary.count}] {result.data_path}: {result.error}",
+                        file=log,
+                    )
+
+        print(summary, file=log)
+        print("Manifest saved at:", manifest_path, file=log)
+        sys.exit(1 if summary.failures else 0)
+
+    if not os.path.exists(args.output):
+        os.makedirs(args.output)
+
+    data_paths = collect_data_files(args.data)
+    if not data_paths:
+        print("No data files found.")
+        sys.exit(1)
+
+    for result in generate_cvs(
+        data_paths,
+        args.font,
+        args.lang,
+        args.output,
+        args.watermark,
+        args.workers,
+        image_cache_size,
+        args.deterministic,
+        args.build_manifest,
+        args.template,
+    ):
+        summary.add(result)
+        if result.ok:
+            print(f"[{summary.count}/{len(data_paths)}] {result.filename}")
+        else:
+            print(
+                f"[{summary.count}/{len(data_paths)}] {result.data_path}: {result.error}"
+            )
+
+    print(summary)
+    sys.exit(1 if summary.failures else 0)
@@ -0,0 +1,289 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from reportlab.lib import pagesizes, units
+from reportlab.pdfgen import canvas
+
+from cv_generator import generate_cv
+from cv_generator.draw import write_text
+from cv_generator.draw.write_text import break_line
+from cv_generator.graphics import crop_to_circle, image_cache, prepare_image
+from cv_generator.layout import (
+    DEFAULT_TEMPLATE,
+    compile_template,
+    measure_cv,
+    paragraph_cache,
+    section_cache,
+)
+from cv_generator.main import use_binary_streams
+from cv_generator.util.data import load_data
+from cv_generator.util.fonts import register_font
+from cv_generator.util import i18n
+from cv_generator.util.i18n import localize, resolve_string
+
+from .synthetic import add_size_arguments, size_arguments, write_cv
+
+METRICS = ("wall_median", "peak_memory", "pdf_size")
+
+
+@dataclass
+class Benchmark:
+    name: str
+    run: Callable[[], None]
+    # Called before every run, outside of the timing.
+    setup: Callable[[], None] = lambda: None
+    # File whose size is recorded after running.
+    output: Optional[str] = None
+
+
+def measure(benchmark: Benchmark, repeat: int) -> dict:
+    benchmark.setup()
+    benchmark.run()
+
+    times = list()
+    for _ in range(repeat):
+        benchmark.setup()
+        start = time.perf_counter()
+        benchmark.run()
+        times.append(time.perf_counter() - start)
+
+    # Measured separately since tracing allocations slows everything down.
+    # Only allocations made through Python are traced, not those of PIL.
+    benchmark.setup()
+    tracemalloc.start()
+    benchmark.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "wall_min": min(times),
+        "wall_median": statistics.median(times),
+        "peak_memory": peak,
+    }
+    if benchmark.output:
+        result["pdf_size"] = os.path.getsize(benchmark.output)
+    return result
+
+
+def strings_in(value) -> list:
+    """Returns every value in the CV data that `resolve_string` accepts."""
+    if isinstance(value, list):
+        return [s for v in value for s in strings_in(v)]
+    if isinstance(value, dict):
+        if value and all(isinstance(v, str) for v in value.values()):
+            return [value]
+        return [s for v in value.values() for s in strings_in(v)]
+    return [value] if isinstance(value, str) else []
+
+
+def create_benchmarks(data_path: str, work_dir: str, font: str) -> list[Benchmark]:
+    data = load_data(data_path)
+    portrait = os.path.join(os.path.dirname(data_path), data["img"])
+    face_name = register_font(font)
+    output = os.path.join(work_dir, "cv.pdf")
+    subset_output = os.path.join(work_dir, "cv_subset.pdf")
+
+    def run_generate_cv():
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_cv(data_path, font, "en", filename="cv.pdf", output_path=work_dir)
+
+    def run_generate_cv_subset():
+        generate_cv(
+            data_path,
+            font,
+            "en",
+            filename="cv_subset.pdf",
+            output_path=work_dir,
+            subset_font=True,
+        )
+
+    def run_write_text():
+        doc = canvas.Canvas(io.BytesIO(), pagesize=pagesizes.A4)
+        text_object = doc.beginText(0.5 * units.cm, pagesizes.A4[1])
+        write_text(
+            text_object,
+            resolve_string(data["summary"], "en"),
+            face_name,
+            14,
+            end_right=6.75 * units.cm,
+        )
+        for entry in data["experience"]:
+            write_text(
+                text_object,
+                resolve_string(entry["company"], "en"),
+                face_name,
+                20,
+                max_width=12 * units.cm,
+                style={"small-caps": True},
+            )
+
+    values = strings_in(data)
+
+    def run_resolve_string():
+        for _ in range(1000):
+            for value in values:
+                resolve_string(value, "de")
+
+    def run_measure_cv():
+        measure_cv(data, data_path, face_name, "en")
+
+    def clear_layout_caches():
+        section_cache.clear()
+        paragraph_cache.clear()
+
+    with open(DEFAULT_TEMPLATE, encoding="utf8") as f:
+        template = json.load(f)
+
+    def run_compile_template():
+        compile_template(template, os.path.dirname(DEFAULT_TEMPLATE))
+
+    def run_localize():
+        for lang in ("en", "de"):
+            localize(data, lang)
+
+    return [
+        Benchmark("generate_cv", run_generate_cv, output=output),
+        Benchmark("generate_cv_subset", run_generate_cv_subset, output=subset_output),
+        Benchmark("write_text", run_write_text, break_line.cache_clear),
+        Benchmark(
+            "crop_to_circle", lambda: crop_to_circle(portrait), image_cache.clear
+        ),
+        Benchmark(
+            "prepare_image",
+            lambda: prepare_image(portrait, 6 * units.cm, 6 * units.cm),
+            image_cache.clear,
+        ),
+        Benchmark("resolve_string", run_resolve_string),
+        Benchmark("localize", run_localize, i18n._views.clear),
+        Benchmark("compile_template", run_compile_template),
+        # Sections measured again, like new CVs, with recurring bullets cached.
+        Benchmark("measure_cv", run_measure_cv, section_cache.clear),
+        Benchmark("measure_cv_cold", run_measure_cv, clear_layout_caches),
+    ]
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = list()
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        for metric in METRICS:
+            if base.get(metric) and result.get(metric, 0) > base[metric] * (
+                1 + threshold
+            ):
+                regressions.append(
+                    f"{name} {metric}: {base[metric]:.6g} -> {result[metric]:.6g} "
+                    f"(+{result[metric] / base[metric] - 1:.0%})"
+                )
+    return regressions
+
+
+def format_change(result: dict, base: Optional[dict], metric: str) -> str:
+    if not base or not base.get(metric) or metric not in result:
+        return ""
+    return f" ({result[metric] / base[metric] - 1:+.0%})"
+
+
+def print_results(results: dict, baseline: Optional[dict] = None):
+    print(f"{'benchmark':<20}{'median':>17}{'min':>12}{'peak mem':>20}{'pdf':>18}")
+    for name, result in results.items():
+        base = baseline["results"].get(name) if baseline else None
+        pdf = (
+            f"{result['pdf_size'] / 1024:.0f} KB{format_change(result, base, 'pdf_size')}"
+            if "pdf_size" in result
+            else "-"
+        )
+        print(
+            f"{name:<20}"
+            f"{result['wall_median'] * 1000:>9.2f} ms{format_change(result, base, 'wall_median'):>5}"
+            f"{result['wall_min'] * 1000:>9.2f} ms"
+            f"{result['peak_memory'] / 1024:>11.0f} KB{format_change(result, base, 'peak_memory'):>6}"
+            f"{pdf:>18}"
+        )
+
+
+parser = argparse.ArgumentParser(
+    prog="benchmarks", description="Benchmark CV-Generator on a synthetic CV."
+)
+add_size_arguments(parser)
+parser.add_argument(
+    "--repeat", "-r", type=int, default=5, help="Timed runs per benchmark."
+)
+parser.add_argument(
+    "--only", help="Comma separated list of benchmarks to run, defaults to all."
+)
+parser.add_argument(
+    "--font",
+    default="SourceSansPro-Regular",
+    help="Name of a font in assets/Source_Sans_Pro or path to a TTF file.",
+)
+parser.add_argument("--save", help="Save the results as a baseline to this file.")
+parser.add_argument(
+    "--compare", help="Compare the results against the baseline in this file."
+)
+parser.add_argument(
+    "--threshold",
+    type=float,
+    default=0.2,
+    help="Relative increase over the baseline that counts as a regression.",
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    # Measured with the same stream encoding as the command line scripts.
+    use_binary_streams()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf8") as f:
+            baseline = json.load(f)
+
+    config = size_arguments(args)
+    if baseline and baseline["config"] != config:
+        print("Warning: the baseline was recorded with a different configuration.")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        data_path = write_cv(os.path.join(work_dir, "data"), **config)
+        # Keeps the benchmarks from touching or clearing the real image cache.
+        image_cache.directory = os.path.join(work_dir, "images")
+
+        only = args.only.split(",") if args.only else None
+        results = dict()
+        for benchmark in create_benchmarks(data_path, work_dir, args.font):
+            if only and benchmark.name not in only:
+                continue
+            results[benchmark.name] = measure(benchmark, args.repeat)
+
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf8") as f:
+            json.dump(
+                {
+                    "config": config,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print("Saved baseline at:", args.save)
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print("Regression:", regression)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,83 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Packages that must only be imported once a CV is rendered.
+HEAVY_PACKAGES = ("reportlab", "PIL", "numpy", "fontTools")
+
+COMMANDS = {
+    "import cv_generator": ["-c", "import cv_generator"],
+    "main.py --help": ["main.py", "--help"],
+    "batch.py --help": ["batch.py", "--help"],
+    "cv_generator --help": ["-m", "cv_generator", "--help"],
+    "cv_generator cache": ["-m", "cv_generator", "cache"],
+}
+
+
+def import_time(args: list[str]) -> tuple[float, list[str]]:
+    """Runs Python with `args` under `-X importtime`.
+
+    Returns the total time spent importing in seconds, and the heavy packages
+    that were imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    heavy = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            # Only top-level imports count, nested ones are part of them.
+            if not name.startswith("  "):
+                total += int(cumulative)
+            package = name.strip().split(".")[0]
+            if package in HEAVY_PACKAGES:
+                heavy.add(package)
+    return total / 1e6, sorted(heavy)
+
+
+def check(budget: float, repeat: int) -> list[str]:
+    failures = list()
+    print(f"{'command':<24}{'import time':>14}  heavy imports")
+    for name, args in COMMANDS.items():
+        runs = [import_time(args) for _ in range(repeat)]
+        duration = min(total for total, _ in runs)
+        heavy = runs[0][1]
+        print(f"{name:<24}{duration * 1000:>11.1f} ms  {', '.join(heavy) or '-'}")
+        if duration > budget:
+            failures.append(f"{name} took {duration * 1000:.1f} ms")
+        if heavy:
+            failures.append(f"{name} imported {', '.join(heavy)}")
+    return failures
+
+
+parser = argparse.ArgumentParser(
+    prog="benchmarks.import_time",
+    description="Check the import time of commands that don't render a CV.",
+)
+parser.add_argument(
+    "--budget",
+    type=float,
+    default=75,
+    help="Import time in milliseconds no command may exceed.",
+)
+parser.add_argument(
+    "--repeat", "-r", type=int, default=3, help="Runs per command, the fastest counts."
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    # The commands are run from the repository root like the CLIs expect.
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    failures = check(args.budget / 1000, args.repeat)
+    for failure in failures:
+        print("Over budget:", failure)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,169 @@
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from cv_generator.main import render_cv
+from cv_generator.util.data import load_data
+from cv_generator.util.file_cache import set_cache_root
+
+from .synthetic import add_size_arguments, size_arguments, write_cv
+
+LANGS = ("en", "de")
+
+
+def render(
+    output: str, data_path: str, font: str, lang: str, subset_font: bool
+) -> bytes:
+    render_cv(
+        output,
+        load_data(data_path),
+        data_path,
+        font,
+        lang,
+        subset_font=subset_font,
+        deterministic=True,
+    )
+    with open(output, "rb") as f:
+        return f.read()
+
+
+def is_complete(pdf: bytes) -> bool:
+    return pdf.startswith(b"%PDF-") and pdf.rstrip().endswith(b"%%EOF")
+
+
+def watch(path: str, stop: threading.Event, errors: list[str]):
+    """Reads `path` until `stop` is set, recording any partial PDF seen."""
+    while not stop.is_set():
+        try:
+            with open(path, "rb") as f:
+                pdf = f.read()
+        except FileNotFoundError:
+            pdf = None
+        if pdf is not None and not is_complete(pdf):
+            errors.append(f"Partial PDF read from {path} ({len(pdf)} bytes)")
+        time.sleep(0.001)
+
+
+def stress(
+    executor, work_dir: str, data_path: str, font: str, renders: int
+) -> list[str]:
+    """Renders `renders` CVs at once in `executor` and checks the results.
+
+    Half of the renders write to one shared path per language and format
+    while a thread reads it, the others write to their own path. Renders are
+    deterministic, so all results of the same language and format must match.
+    """
+    os.makedirs(work_dir)
+    jobs = list()
+    shared = set()
+    for i in range(renders):
+        lang = LANGS[i % len(LANGS)]
+        subset_font = i % 4 >= 2
+        name = f"{lang}_{'subset' if subset_font else 'type1'}"
+        if i % 8 < 4:
+            output = os.path.join(work_dir, f"{name}.pdf")
+            shared.add(output)
+        else:
+            output = os.path.join(work_dir, f"{name}_{i}.pdf")
+        jobs.append((name, output, lang, subset_font))
+
+    errors = list()
+    stop = threading.Event()
+    watchers = [
+        threading.Thread(target=watch, args=(path, stop, errors)) for path in shared
+    ]
+    for watcher in watchers:
+        watcher.start()
+    try:
+        futures = {
+            executor.submit(render, output, data_path, font, lang, subset_font): name
+            for name, output, lang, subset_font in jobs
+        }
+        wait(futures)
+    finally:
+        stop.set()
+        for watcher in watchers:
+            watcher.join()
+
+    results = dict()
+    for future, name in futures.items():
+        try:
+            pdf = future.result()
+        except Exception as e:
+            errors.append(f"{name}: {type(e).__name__}: {e}")
+            continue
+        if not is_complete(pdf):
+            errors.append(f"{name}: incomplete PDF ({len(pdf)} bytes)")
+        elif results.setdefault(name, pdf) != pdf:
+            errors.append(f"{name}: output differs between renders")
+
+    for path in glob.glob(os.path.join(work_dir, "*.tmp")):
+        errors.append(f"Temporary file left behind: {path}")
+    return errors
+
+
+parser = argparse.ArgumentParser(
+    prog="benchmarks.stress",
+    description="Render many CVs at once from threads and processes and check the results.",
+)
+add_size_arguments(parser)
+parser.add_argument(
+    "--renders", "-n", type=int, default=32, help="Renders per executor."
+)
+parser.add_argument(
+    "--workers", "-w", type=int, default=8, help="Threads and processes to use."
+)
+parser.add_argument(
+    "--font",
+    default="SourceSansPro-Regular",
+    help="Name of a font in assets/Source_Sans_Pro or path to a TTF file.",
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as work_dir:
+        data_path = write_cv(os.path.join(work_dir, "data"), **size_arguments(args))
+
+        # Processes first, so they are forked before this process has
+        # registered any fonts and each converts them itself.
+        for name, executor_type in (
+            ("processes", ProcessPoolExecutor),
+            ("threads", ThreadPoolExecutor),
+        ):
+            # An empty cache for each run, so fonts are converted and images
+            # prepared by concurrent renders too.
+            cache_dir = os.path.join(work_dir, f"cache_{name}")
+            set_cache_root(cache_dir)
+
+            start = time.perf_counter()
+            with executor_type(max_workers=args.workers) as executor:
+                errors = stress(
+                    executor,
+                    os.path.join(work_dir, name),
+                    data_path,
+                    args.font,
+                    args.renders,
+                )
+            errors += [
+                f"Temporary file left behind: {path}"
+                for path in glob.glob(
+                    os.path.join(cache_dir, "**", "*.tmp"), recursive=True
+                )
+            ]
+
+            print(
+                f"{name:<10} {args.renders} renders in "
+                f"{time.perf_counter() - start:.2f}s, {len(errors)} errors"
+            )
+            for error in errors:
+                print("  ", error)
+            failed = failed or bool(errors)
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import random
+
+from PIL import Image
+
+from cv_generator.util.i18n import strings
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat duis aute "
+    "irure in reprehenderit voluptate velit esse cillum fugiat nulla pariatur"
+).split()
+LANGUAGES = tuple(strings["language_codes"])
+FLUENCIES = tuple(strings["language_level"])
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def translated(rng: random.Random, words: int) -> dict:
+    return {lang: sentence(rng, words) for lang in LANGUAGES}
+
+
+def make_portrait(path: str, resolution: int):
+    """Writes a `resolution` x 4/3 `resolution` JPEG with a smooth gradient."""
+    size = (resolution, resolution * 4 // 3)
+    vertical = Image.linear_gradient("L")
+    horizontal = vertical.transpose(Image.Transpose.ROTATE_90)
+    Image.merge(
+        "RGB", (vertical.resize(size), horizontal.resize(size), vertical.resize(size))
+    ).save(path, quality=90)
+
+
+def make_cv(
+    experience: int = 4,
+    tasks: int = 3,
+    summary_words: int = 40,
+    languages: int = 2,
+    projects: int = 2,
+    education: int = 2,
+    seed: int = 0,
+) -> dict:
+    """Returns CV data with the given number of entries and random text."""
+    rng = random.Random(seed)
+    return {
+        "name": {"first": "Jane", "last": "Doe"},
+        "img": "portrait.jpg",
+        "headline": translated(rng, 3),
+        "summary": translated(rng, summary_words),
+        "phone": "+41 00 000 00 00",
+        "email": "jane@example.com",
+        "website": "example.com",
+        "languages": [
+            {
+                "language": LANGUAGES[i % len(LANGUAGES)],
+                "fluency": FLUENCIES[i % len(FLUENCIES)],
+            }
+            for i in range(languages)
+        ],
+        "experience": [
+            {
+                "company": sentence(rng, 2)[:-1],
+                "position": translated(rng, 2),
+                "start": str(2020 - 2 * i),
+                "end": str(2022 - 2 * i),
+                "tasks": [translated(rng, rng.randint(8, 24)) for _ in range(tasks)],
+            }
+            for i in range(experience)
+        ],
+        "projects": [
+            {"description": translated(rng, rng.randint(8, 24))}
+            for _ in range(projects)
+        ],
+        "education": [
+            {
+                "institution": sentence(rng, 3)[:-1],
+                "field": translated(rng, 2),
+                "start": str(2010 + 2 * i),
+                "end": str(2012 + 2 * i),
+                "tasks": [translated(rng, rng.randint(8, 16))],
+            }
+            for i in range(education)
+        ],
+    }
+
+
+def write_cv(directory: str, portrait: int = 1200, **kwargs) -> str:
+    """Writes a synthetic CV and its portrait to `directory`.
+
+    Returns the path to the JSON file, `kwargs` are passed to `make_cv`.
+    """
+    os.makedirs(directory, exist_ok=True)
+    data = make_cv(**kwargs)
+    make_portrait(os.path.join(directory, data["img"]), portrait)
+    data_path = os.path.join(directory, "cv.json")
+    with open(data_path, "w", encoding="utf8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return data_path
+
+
+def add_size_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--experience", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=3, help="Tasks per entry.")
+    parser.add_argument("--summary-words", type=int, default=40)
+    parser.add_argument("--languages", type=int, default=2)
+    parser.add_argument("--projects", type=int, default=2)
+    parser.add_argument("--education", type=int, default=2)
+    parser.add_argument(
+        "--portrait", type=int, default=1200, help="Portrait width in pixels."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def size_arguments(args: argparse.Namespace) -> dict:
+    return {
+        "experience": args.experience,
+        "tasks": args.tasks,
+        "summary_words": args.summary_words,
+        "languages": args.languages,
+        "projects": args.projects,
+        "education": args.education,
+        "portrait": args.portrait,
+        "seed": args.seed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic CV.")
+    parser.add_argument("output", help="Directory to write the CV to.")
+    add_size_arguments(parser)
+    args = parser.parse_args()
+
+    print("Saved at:", write_cv(args.output, **size_arguments(args)))
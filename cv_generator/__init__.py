@@ -1 +1,24 @@
-from .main import generate_cv
+import importlib
+
+# Loaded on first access, so importing the package or one of its light
+# modules doesn't pull in reportlab, PIL and numpy.
+_lazy = {
+    "generate_cv": ".main",
+    "generate_cv_async": ".aio",
+    "generate_cvs_async": ".aio",
+    "Profiler": ".util.profiling",
+}
+
+__all__ = list(_lazy)
+
+
+def __getattr__(name: str):
+    if name not in _lazy:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_lazy[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_lazy})
@@ -0,0 +1,88 @@
+import argparse
+
+from .graphics.image_cache import image_cache
+from .util.file_cache import set_cache_root
+
+parser = argparse.ArgumentParser(prog="cv_generator", description="CV-Generator.")
+parser.add_argument(
+    "--cache-dir",
+    dest="cache_dir",
+    help="Directory for converted fonts and prepared images, defaults to $CV_GENERATOR_CACHE or __cache__.",
+)
+subparsers = parser.add_subparsers(dest="command", required=True)
+
+serve_parser = subparsers.add_parser("serve", help="Run a local render server.")
+serve_parser.add_argument("--host", default="127.0.0.1", help="The host to listen on.")
+serve_parser.add_argument(
+    "--port", "-p", type=int, default=8080, help="The port to listen on."
+)
+serve_parser.add_argument(
+    "--data-dir",
+    "-d",
+    dest="data_dir",
+    default="./",
+    help="Directory that images referenced by the data are resolved against.",
+)
+serve_parser.add_argument(
+    "--workers",
+    "-w",
+    dest="workers",
+    type=int,
+    default=None,
+    help="Number of worker processes, defaults to the number of CPUs.",
+)
+serve_parser.add_argument(
+    "--max-pending",
+    dest="max_pending",
+    type=int,
+    default=None,
+    help="Requests queued before the server responds with 503, defaults to the number of workers.",
+)
+serve_parser.add_argument(
+    "--font",
+    default="SourceSansPro-Regular",
+    help="Name of a font in assets/Source_Sans_Pro or path to a TTF file.",
+)
+serve_parser.add_argument(
+    "--timeout",
+    "-t",
+    type=float,
+    default=30,
+    help="Seconds to wait for a render before responding with 504.",
+)
+
+cache_parser = subparsers.add_parser("cache", help="Show or clear the image cache.")
+cache_parser.add_argument(
+    "--clear", action="store_true", help="Remove all cached images."
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    if args.cache_dir:
+        set_cache_root(args.cache_dir)
+
+    if args.command == "serve":
+        from .main import use_binary_streams
+        from .server import serve
+
+        use_binary_streams()
+        serve(
+            args.host,
+            args.port,
+            args.font,
+            args.data_dir,
+            args.workers,
+            args.max_pending,
+            args.timeout,
+        )
+    elif args.command == "cache":
+        if args.clear:
+            image_cache.clear()
+        stats = image_cache.stats()
+        print(f"Directory: {image_cache.directory}")
+        print(f"Entries: {stats['entries']}")
+        print(
+            f"Size: {stats['size'] / 1024**2:.1f} MB"
+            f" / {stats['max_size'] / 1024**2:.1f} MB"
+        )
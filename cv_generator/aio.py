@@ -0,0 +1,172 @@
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import Executor
+from contextlib import nullcontext
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, Iterable, Optional
+
+from .batch import BatchResult, get_filename_prefixes
+from .main import get_jobs, render_cv
+from .util.build import get_build_date
+from .util.data import load_data
+from .util.file_cache import atomic_path
+
+
+def _write(path: str, pdf: bytes):
+    with atomic_path(path) as tmp:
+        with open(tmp, "wb") as f:
+            f.write(pdf)
+
+
+async def render_cv_async(
+    data: dict,
+    data_path: str,
+    font: str | tuple[str, str],
+    lang: str = "en",
+    title: str = None,
+    include_watermark: bool = True,
+    image_dpi: int = 300,
+    executor: Optional[Executor] = None,
+    limit: Optional[asyncio.Semaphore] = None,
+    **kwargs,
+) -> bytes:
+    """Renders the CV with `render_cv` in `executor` and returns the PDF.
+
+    `executor` defaults to the event loop's thread pool. Renders are CPU bound,
+    so a `ProcessPoolExecutor` is needed for them to run in parallel. With
+    `limit`, the render waits for the semaphore before it is submitted.
+    Cancelling only stops a render that hasn't started yet, one that is
+    already running finishes in the executor and its result is dropped.
+    """
+    async with limit or nullcontext():
+        return await asyncio.get_running_loop().run_in_executor(
+            executor,
+            functools.partial(
+                render_cv,
+                None,
+                data,
+                data_path,
+                font,
+                lang,
+                title,
+                include_watermark,
+                image_dpi,
+                **kwargs,
+            ),
+        )
+
+
+async def generate_cv_async(
+    data_path: str,
+    font: str | tuple[str, str],
+    lang: str | list[str] = "en",
+    title: str = None,
+    filename: str = None,
+    output_path: str = "./",
+    include_watermark: bool = True,
+    image_dpi: int = 300,
+    executor: Optional[Executor] = None,
+    limit: Optional[asyncio.Semaphore] = None,
+    output: BinaryIO = None,
+    filename_prefix: str = "",
+    **kwargs,
+) -> str | list[str]:
+    """Generates the CV like `generate_cv` without blocking the event loop.
+
+    The data is read in a thread and every language is rendered with
+    `render_cv_async` in `executor`, limited by `limit`. Files are only
+    written once their render has finished, so a cancelled call leaves no
+    partial PDFs behind. Every filename starts with `filename_prefix`. Other
+    keyword arguments are passed to `render_cv`, with `deterministic` the
+    date in filenames and titles is taken from `SOURCE_DATE_EPOCH` if set.
+    """
+    data = await asyncio.to_thread(load_data, data_path)
+
+    langs = [lang] if isinstance(lang, str) else list(lang)
+    if output is not None and len(langs) > 1:
+        raise ValueError("An output stream can only hold a single language")
+    jobs = get_jobs(
+        data,
+        langs,
+        title,
+        filename,
+        get_build_date() if kwargs.get("deterministic") else None,
+        filename_prefix,
+    )
+
+    async def generate(cv_filename: str, cv_title: str, cv_lang: str):
+        pdf = await render_cv_async(
+            data,
+            data_path,
+            font,
+            cv_lang,
+            cv_title,
+            include_watermark,
+            image_dpi,
+            executor,
+            limit,
+            **kwargs,
+        )
+        if output is not None:
+            output.write(pdf)
+        else:
+            await asyncio.to_thread(_write, os.path.join(output_path, cv_filename), pdf)
+
+    await asyncio.gather(*(generate(*job) for job in jobs))
+    filenames = [cv_filename for cv_filename, _, _ in jobs]
+    return filenames[0] if isinstance(lang, str) else filenames
+
+
+async def generate_cvs_async(
+    data_paths: Iterable[str],
+    font: str | tuple[str, str],
+    lang: str = "en",
+    output_path: str = "./",
+    include_watermark: bool = True,
+    executor: Optional[Executor] = None,
+    max_concurrency: int = 4,
+) -> AsyncIterator[BatchResult]:
+    """Generates a CV for every data file and yields the results as they finish.
+
+    At most `max_concurrency` CVs are rendered at a time. Failures are
+    reported in the results instead of being raised. CVs that would share a
+    filename are told apart by a prefix, see `get_filename_prefixes`.
+    """
+    limit = asyncio.Semaphore(max_concurrency)
+    data_paths = list(data_paths)
+    prefixes = await asyncio.to_thread(
+        get_filename_prefixes, data_paths, lang, datetime.today()
+    )
+
+    async def generate(data_path: str, prefix: str) -> BatchResult:
+        start = time.perf_counter()
+        result = BatchResult(data_path)
+        try:
+            # Held while reading too, so waiting files aren't loaded early.
+            async with limit:
+                result.filename = await generate_cv_async(
+                    data_path,
+                    font,
+                    lang,
+                    output_path=output_path,
+                    include_watermark=include_watermark,
+                    executor=executor,
+                    filename_prefix=prefix,
+                )
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.duration = time.perf_counter() - start
+        return result
+
+    tasks = [
+        asyncio.create_task(generate(data_path, prefix))
+        for data_path, prefix in zip(data_paths, prefixes)
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
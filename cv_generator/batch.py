@@ -0,0 +1,292 @@
+import dataclasses
+import glob
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, TextIO
+
+from .graphics.image_cache import image_cache
+from .main import generate_cv, get_filename, get_jobs, get_title, render_cv
+from .util.archive import Archive
+from .util.build import get_build_date
+from .util.data import load_data
+from .util.fonts import register_font
+
+
+@dataclass
+class BatchResult:
+    data_path: str
+    filename: Optional[str] = None
+    error: Optional[str] = None
+    duration: float = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchSummary:
+    """Totals of a batch, only failed results are kept."""
+
+    count: int = 0
+    failures: list[BatchResult] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    finished: Optional[float] = None
+
+    def add(self, result: BatchResult):
+        self.count += 1
+        if not result.ok:
+            self.failures.append(result)
+        self.cache_hits += result.cache_hits
+        self.cache_misses += result.cache_misses
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        return self.count / self.elapsed if self.elapsed else 0
+
+    def __str__(self):
+        lines = [
+            f"Rendered {self.count - len(self.failures)}/{self.count} CVs "
+            f"in {self.elapsed:.2f}s ({self.throughput:.2f} CVs/s)"
+        ]
+        if self.cache_hits or self.cache_misses:
+            lines.append(
+                f"Portrait cache: {self.cache_hits} hits, {self.cache_misses} misses "
+                f"({self.cache_hits / (self.cache_hits + self.cache_misses):.0%} hit rate)"
+            )
+        for result in self.failures:
+            lines.append(f"  Failed: {result.data_path}: {result.error}")
+        return "\n".join(lines)
+
+
+def collect_data_files(patterns: Iterable[str]) -> list[str]:
+    data_paths = list()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "**", "*.json"), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        for match in sorted(matches):
+            if match not in data_paths:
+                data_paths.append(match)
+    return data_paths
+
+
+def get_filename_prefixes(
+    data_paths: list[str], lang: str, today: datetime
+) -> list[str]:
+    """Returns a filename prefix for every data file, so no two CVs share a name.
+
+    Data files whose CVs would be saved under the same name get their path
+    relative to the directory they share, `a_cv_` for `a/cv.json` and
+    `b/cv.json`. The prefix doesn't depend on the date or the order of the
+    files, and it isn't an input of the build manifest, see `generate_cv`.
+    Other files, and those that can't be loaded, get no prefix.
+    """
+    paths = dict()
+    for data_path in data_paths:
+        try:
+            filename = get_jobs(load_data(data_path), [lang], today=today)[0][0]
+        except Exception:
+            continue
+        paths.setdefault(filename, list()).append(os.path.abspath(data_path))
+
+    prefixes = dict()
+    for same_name in paths.values():
+        if len(same_name) < 2:
+            continue
+        common = os.path.commonpath([os.path.dirname(path) for path in same_name])
+        for path in same_name:
+            relative = os.path.splitext(os.path.relpath(path, common))[0]
+            prefixes[path] = relative.replace(os.sep, "_") + "_"
+    return [prefixes.get(os.path.abspath(path), "") for path in data_paths]
+
+
+def _init_worker(font: str | tuple[str, str], image_cache_size: Optional[int]):
+    register_font(font)
+    if image_cache_size is not None:
+        image_cache.max_size = image_cache_size
+
+
+def _render(data_path: str, font: str | tuple[str, str], **kwargs) -> BatchResult:
+    start = time.perf_counter()
+    hits, misses = image_cache.hits, image_cache.misses
+    result = BatchResult(data_path)
+    try:
+        result.filename = generate_cv(data_path, font, **kwargs)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.duration = time.perf_counter() - start
+    result.cache_hits = image_cache.hits - hits
+    result.cache_misses = image_cache.misses - misses
+    return result
+
+
+def generate_cvs(
+    data_paths: Iterable[str],
+    font: str | tuple[str, str],
+    lang: str = "en",
+    output_path: str = "./",
+    include_watermark: bool = True,
+    max_workers: int = None,
+    image_cache_size: int = None,
+    deterministic: bool = False,
+    build_manifest: str = None,
+    template: str = None,
+) -> Iterator[BatchResult]:
+    """Generates a CV for every data file, see `generate_cv` for the options.
+
+    Every entry of `build_manifest` is its own file, so the workers can share
+    it. CVs that would share a filename are told apart by a prefix, see
+    `get_filename_prefixes`.
+    """
+    data_paths = list(data_paths)
+    prefixes = get_filename_prefixes(
+        data_paths, lang, get_build_date() if deterministic else datetime.today()
+    )
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(font, image_cache_size),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _render,
+                data_path,
+                font,
+                lang=lang,
+                output_path=output_path,
+                include_watermark=include_watermark,
+                deterministic=deterministic,
+                build_manifest=build_manifest,
+                template=template,
+                filename_prefix=prefix,
+            )
+            for data_path, prefix in zip(data_paths, prefixes)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def iter_records(file: TextIO, source: str) -> Iterator[tuple[str, str]]:
+    """Yields every non-empty line of a JSON Lines file with its location."""
+    for number, line in enumerate(file, 1):
+        if line.strip():
+            yield f"{source}:{number}", line
+
+
+def _render_record(
+    index: int,
+    record: str,
+    line: str,
+    data_dir: str,
+    font: str | tuple[str, str],
+    lang: str,
+    include_watermark: bool,
+    deterministic: bool,
+    template: Optional[str],
+) -> tuple[BatchResult, Optional[bytes]]:
+    start = time.perf_counter()
+    hits, misses = image_cache.hits, image_cache.misses
+    result = BatchResult(record)
+    pdf = None
+    try:
+        data = json.loads(line)
+        if data.get("img"):
+            data["img"] = os.path.abspath(os.path.join(data_dir, data["img"]))
+        today = get_build_date() if deterministic else datetime.today()
+        title = get_title(data, lang, today)
+        # Prefixed with the record's position so entries never collide.
+        result.filename = f"{index:06d}_{get_filename(data, title, lang, today)}"
+        pdf = render_cv(
+            None,
+            data,
+            data_dir,
+            font,
+            lang,
+            title,
+            include_watermark=include_watermark,
+            deterministic=deterministic,
+            template=template,
+        )
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.duration = time.perf_counter() - start
+    result.cache_hits = image_cache.hits - hits
+    result.cache_misses = image_cache.misses - misses
+    return result, pdf
+
+
+def generate_cvs_from_records(
+    records: Iterable[tuple[str, str]],
+    archive: Archive,
+    font: str | tuple[str, str],
+    lang: str = "en",
+    data_dir: str = "./",
+    include_watermark: bool = True,
+    max_workers: int = None,
+    max_pending: int = None,
+    image_cache_size: int = None,
+    manifest: TextIO = None,
+    deterministic: bool = False,
+    template: str = None,
+) -> Iterator[BatchResult]:
+    """Renders JSON records from `iter_records` into `archive`.
+
+    Records are read only as workers free up, at most `max_pending` are in
+    flight, and every PDF is added to the archive as soon as it finishes, so
+    memory doesn't grow with the number of records. Portraits are resolved
+    against `data_dir`. A JSON line per record is written to `manifest` with
+    its filename in the archive or the error it failed with.
+    """
+    max_workers = max_workers or os.cpu_count()
+    max_pending = max_pending or 2 * max_workers
+
+    def store(futures) -> Iterator[BatchResult]:
+        for future in futures:
+            result, pdf = future.result()
+            if pdf is not None:
+                archive.add(result.filename, pdf)
+            if manifest is not None:
+                manifest.write(json.dumps(dataclasses.asdict(result)) + "\n")
+                manifest.flush()
+            yield result
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(font, image_cache_size),
+    ) as executor:
+        pending = set()
+        for index, (record, line) in enumerate(records, 1):
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from store(done)
+            pending.add(
+                executor.submit(
+                    _render_record,
+                    index,
+                    record,
+                    line,
+                    data_dir,
+                    font,
+                    lang,
+                    include_watermark,
+                    deterministic,
+                    template,
+                )
+            )
+        yield from store(as_completed(pending))
@@ -1 +1,2 @@
+from .draw_circle_image import draw_circle_image
 from .write_text import write_text
@@ -0,0 +1,14 @@
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+
+def draw_circle_image(
+    doc: canvas.Canvas, image: str | ImageReader, x: float, y: float, size: float
+):
+    """Draws `image` into a `size` x `size` square clipped to a circle."""
+    doc.saveState()
+    clip = doc.beginPath()
+    clip.circle(x + size / 2, y + size / 2, size / 2)
+    doc.clipPath(clip, stroke=0, fill=0)
+    doc.drawImage(image, x, y, width=size, height=size)
+    doc.restoreState()
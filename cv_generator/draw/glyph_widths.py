@@ -0,0 +1,71 @@
+import numpy as np
+from reportlab.pdfbase import pdfmetrics
+
+TABLE_SIZE = 0x10000
+
+_tables: dict[str, np.ndarray] = dict()
+_space_widths: dict[str, float] = dict()
+_unchanged_by_upper: np.ndarray = None
+
+
+def code_points(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def _char_width(char: str, face_name: str) -> float:
+    # Width in 1/1000 em, rounded to undo the float error of reportlab's scaling.
+    return round(pdfmetrics.stringWidth(char, face_name, 1000), 6)
+
+
+def glyph_widths(codes: np.ndarray, face_name: str) -> np.ndarray:
+    """Returns the advance widths of `codes` in 1/1000 em.
+
+    Widths are looked up in a table indexed by code point that is built once
+    per font and filled in as new characters are encountered.
+    """
+    table = _tables.get(face_name)
+    if table is None:
+        table = _tables[face_name] = np.full(TABLE_SIZE, np.nan)
+
+    in_table = codes < TABLE_SIZE
+    if not in_table.all():
+        widths = np.empty(len(codes))
+        widths[in_table] = glyph_widths(codes[in_table], face_name)
+        widths[~in_table] = [
+            _char_width(chr(code), face_name) for code in codes[~in_table]
+        ]
+        return widths
+
+    widths = table[codes]
+    missing = np.isnan(widths)
+    if missing.any():
+        for code in np.unique(codes[missing]):
+            table[code] = _char_width(chr(code), face_name)
+        widths = table[codes]
+    return widths
+
+
+def space_width(face_name: str) -> float:
+    """Returns the width of a space in 1/1000 em."""
+    if face_name not in _space_widths:
+        _space_widths[face_name] = _char_width(" ", face_name)
+    return _space_widths[face_name]
+
+
+def unchanged_by_upper(codes: np.ndarray) -> np.ndarray:
+    """Returns whether `char == char.upper()` for each code point."""
+    global _unchanged_by_upper
+    if _unchanged_by_upper is None:
+        _unchanged_by_upper = np.array(
+            [chr(code) == chr(code).upper() for code in range(TABLE_SIZE)]
+        )
+
+    in_table = codes < TABLE_SIZE
+    if not in_table.all():
+        unchanged = np.empty(len(codes), dtype=bool)
+        unchanged[in_table] = _unchanged_by_upper[codes[in_table]]
+        unchanged[~in_table] = [
+            chr(code) == chr(code).upper() for code in codes[~in_table]
+        ]
+        return unchanged
+    return _unchanged_by_upper[codes]
@@ -1,8 +1,12 @@
+from functools import lru_cache
+from itertools import groupby
 from typing import overload
 
-from reportlab.pdfbase import pdfmetrics
+import numpy as np
 from reportlab.pdfgen import canvas, textobject
 
+from .glyph_widths import code_points, glyph_widths, space_width, unchanged_by_upper
+
 
 @overload
 def write_text(
@@ -12,8 +16,7 @@ def write_text(
     size: int,
     max_width: int,
     style: dict = None,
-) -> tuple[int, int]:
-    ...
+) -> tuple[int, int]: ...
 
 
 @overload
@@ -24,8 +27,89 @@ def write_text(
     size: int,
     end_right: int,
     style: dict = None,
-) -> tuple[int, int]:
-    ...
+) -> tuple[int, int]: ...
+
+
+@lru_cache(maxsize=4096)
+def break_line(
+    line: str,
+    face_name: str,
+    font_size: int,
+    max_width: float,
+    small_caps: bool = False,
+    char_space: float = 0,
+) -> tuple[tuple[str, float], ...]:
+    """Breaks `line` at spaces so that no line reaches `max_width`.
+
+    Returns the text of each line and its width including the trailing space.
+    Word widths come from the glyph-width table of the font and the break
+    points are found with a binary search over their cumulative sum.
+    """
+    words = line.split(" ")
+    codes = code_points(line)
+    widths = glyph_widths(codes, face_name)
+    if small_caps:
+        widths = np.where(unchanged_by_upper(codes), widths, widths * 0.8)
+
+    cumulative = np.cumsum(widths)
+    spaces = np.flatnonzero(codes == 32)
+    # Cumulative width at the start and end of each word, the spaces between
+    # them are measured separately.
+    starts = np.empty(len(words))
+    starts[0] = 0
+    starts[1:] = cumulative[spaces]
+    ends = np.empty(len(words))
+    ends[:-1] = cumulative[spaces] - widths[spaces]
+    ends[-1] = cumulative[-1]
+    word_widths = (ends - starts) * 0.001 * font_size
+    if small_caps:
+        word_widths += char_space * np.fromiter(map(len, words), int, len(words)) - 1
+
+    space = space_width(face_name) * 0.001 * font_size
+    # Width of the words before each word, and up to the end of each word.
+    before = np.empty(len(words) + 1)
+    before[0] = 0
+    np.cumsum(word_widths + space, out=before[1:])
+    until = before[:-1] + word_widths
+
+    lines = list()
+    if small_caps and np.any(until[1:] < until[:-1]):
+        start, width = 0, 0
+        for i, word_width in enumerate(word_widths):
+            if width + word_width >= max_width:
+                lines.append((" ".join(words[start:i]), width))
+                start, width = i, 0
+            width += word_width + space
+        lines.append((" ".join(words[start:]), width))
+        return tuple(lines)
+
+    # The word that starts a line is only tested against the previous line.
+    start, search = 0, 0
+    while True:
+        end = search + int(
+            np.searchsorted(until[search:], max_width + before[start], side="left")
+        )
+        if end >= len(words):
+            break
+        lines.append((" ".join(words[start:end]), float(before[end] - before[start])))
+        start, search = end, end + 1
+    lines.append((" ".join(words[start:]), float(before[-1] - before[start])))
+    return tuple(lines)
+
+
+def write_small_caps(
+    text_object: textobject.PDFTextObject, text: str, face_name: str, font_size: int
+):
+    """Writes lowercase letters as uppercase at 80% of `font_size`.
+
+    Consecutive characters of the same case are written as one run so the
+    font is only switched when the case changes.
+    """
+    for unchanged, run in groupby(text, key=lambda char: char.upper() == char):
+        size = font_size if unchanged else font_size * 0.8
+        if text_object._fontname != face_name or text_object._fontsize != size:
+            text_object.setFont(face_name, size)
+        text_object.textOut("".join(run) if unchanged else "".join(run).upper())
 
 
 def write_text(
@@ -46,74 +130,25 @@ def write_text(
 
     text_object.setFont(face_name, font_size)
 
-    space_width = pdfmetrics.stringWidth(
-        " ", text_object._fontname, text_object._fontsize
-    )
+    small_caps = style.get("small-caps", False)
+    char_space = getattr(text_object, "_charSpace", None)
+    if char_space is None:
+        char_space = text_object._canvas._charSpace
+    char_space = char_space or font_size * 0.08
     max_line_width = 0
     for line in text.splitlines():
         if not line:
             text_object.textLine("")
-        else:
-            words = list()
-            width = 0
-            for word in line.split(" "):
-                if style.get("small-caps", False):
-                    word_width = 0
-                    for char in word:
-                        if char == char.upper():
-                            word_width += pdfmetrics.stringWidth(
-                                char, face_name, font_size
-                            )
-                        else:
-                            word_width += pdfmetrics.stringWidth(
-                                char, face_name, font_size * 0.8
-                            )
-                    word_width += (
-                        getattr(
-                            text_object,
-                            "_charSpace",
-                            text_object._canvas._charSpace,
-                        )
-                        or font_size * 0.08
-                    ) * len(word) - 1
-                else:
-                    word_width = pdfmetrics.stringWidth(
-                        word, text_object._fontname, text_object._fontsize
-                    )
-
-                if width + word_width >= max_width:
-                    l = " ".join(words)
-                    if style.get("small-caps", False):
-                        for char in l:
-                            if char.upper() == char:
-                                text_object.setFont(face_name, font_size)
-                                text_object.textOut(char)
-                            else:
-                                text_object.setFont(face_name, font_size * 0.8)
-                                text_object.textOut(char.upper())
-                    else:
-                        text_object.textLine(l)
-                    words = list()
-                    if width >= max_line_width:
-                        max_line_width = width
-                    width = 0
-
-                words.append(word)
-                width += word_width + space_width
-            if words:
-                l = " ".join(words)
-                if style.get("small-caps", False):
-                    for char in l:
-                        if char.upper() == char:
-                            text_object.setFont(face_name, font_size)
-                            text_object.textOut(char)
-                        else:
-                            text_object.setFont(face_name, font_size * 0.8)
-                            text_object.textOut(char.upper())
-                else:
-                    text_object.textLine(l)
-                if width >= max_line_width:
-                    max_line_width = width
+            continue
+        for l, width in break_line(
+            line, face_name, font_size, max_width, small_caps, char_space
+        ):
+            if small_caps:
+                write_small_caps(text_object, l, face_name, font_size)
+            else:
+                text_object.textLine(l)
+            if width >= max_line_width:
+                max_line_width = width
 
     height = start_y - text_object.getY()
     return max_line_width, height
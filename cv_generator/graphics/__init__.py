@@ -1 +1,24 @@
-from .crop_to_circle import crop_to_circle
+import importlib
+
+from .image_cache import image_cache
+
+# Loaded on first access so the image cache can be used without PIL. Only
+# functions are loaded lazily, modules named like them must not be imported
+# directly or they would shadow the function.
+_lazy = {
+    "crop_to_circle": ".crop_to_circle",
+    "load_image": ".load_image",
+    "prepare_image": ".prepare_image",
+}
+
+
+def __getattr__(name: str):
+    if name not in _lazy:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_lazy[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_lazy})
@@ -1,15 +1,19 @@
-import os
+import hashlib
 import sys
 
 from PIL import Image, ImageDraw, ImageOps
 
+from ..util.file_cache import hash_file
+from .image_cache import image_cache
+
 
 def crop_to_circle(file, size=None, bg_color=(255, 255, 255)):
-    path = os.path.join(
-        "__cache__",
-        "images",
-        (os.path.splitext(os.path.basename(file))[0] + "_circle.png"),
-    )
+    key = hashlib.sha256(
+        f"{hash_file(file)}:{size}:{tuple(bg_color)}".encode("utf8")
+    ).hexdigest()[:32]
+    cached = image_cache.get(f"{key}_circle.png")
+    if cached:
+        return cached
 
     _img = Image.open(file)
     if _img.mode == "RGBA":
@@ -29,8 +33,9 @@ def crop_to_circle(file, size=None, bg_color=(255, 255, 255)):
     output = ImageOps.fit(img, mask.size, centering=(0.5, 0.5))
     output.putalpha(mask)
 
-    output.save(path)
-    return path
+    return image_cache.put(
+        f"{key}_circle.png", lambda path: output.save(path, format="PNG")
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,3 @@
+from ..util.file_cache import FileCache
+
+image_cache = FileCache.named("images", max_size=256 * 1024**2)
@@ -0,0 +1,23 @@
+import os
+import threading
+
+from reportlab.lib.utils import ImageReader
+
+# Readers decode lazily and keep their file open, so every thread has its own.
+_local = threading.local()
+
+
+def load_image(path: str) -> ImageReader:
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime
+
+    images: dict[str, tuple[float, ImageReader]] = getattr(_local, "images", None)
+    if images is None:
+        images = _local.images = dict()
+    cached = images.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    img = ImageReader(path)
+    images[path] = (mtime, img)
+    return img
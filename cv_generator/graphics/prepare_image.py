@@ -0,0 +1,67 @@
+import hashlib
+import os
+import sys
+
+from PIL import Image, ImageOps
+
+from ..util.file_cache import hash_file
+from .image_cache import image_cache
+
+
+def prepare_image(
+    file: str,
+    width: float,
+    height: float,
+    dpi: int = 300,
+    bg_color=(255, 255, 255),
+) -> str:
+    """Crops `file` to fill `width` x `height` points and resamples it to `dpi`.
+
+    JPEG sources are decoded in draft mode close to the target size and saved
+    as JPEG so reportlab can embed them as-is, other images are flattened onto
+    `bg_color` and saved as PNG to be embedded with Flate compression.
+    """
+    size = (round(width / 72 * dpi), round(height / 72 * dpi))
+    key = hashlib.sha256(
+        f"{hash_file(file)}:{size}:{tuple(bg_color)}".encode("utf8")
+    ).hexdigest()[:32]
+
+    is_jpeg = os.path.splitext(file)[1].lower() in (".jpg", ".jpeg")
+    extension = "jpg" if is_jpeg else "png"
+    cached = image_cache.get(f"{key}.{extension}")
+    if cached:
+        return cached
+
+    img = Image.open(file)
+    if img.format == "JPEG":
+        # Only scales down by powers of two, never below the requested size.
+        img.draft("RGB", size)
+
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGBA", img.size, tuple(bg_color))
+        background.alpha_composite(img)
+        img = background
+    img = img.convert("RGB")
+
+    if img.size[0] < size[0] or img.size[1] < size[1]:
+        # Never upsample, the PDF viewer scales the image just as well.
+        scale = min(img.size[0] / size[0], img.size[1] / size[1])
+        size = (round(size[0] * scale), round(size[1] * scale))
+
+    output = ImageOps.fit(
+        img, size, method=Image.Resampling.LANCZOS, centering=(0.5, 0.5)
+    )
+
+    if extension == "jpg":
+        save = lambda path: output.save(
+            path, format="JPEG", quality=90, optimize=True, progressive=False
+        )
+    else:
+        save = lambda path: output.save(path, format="PNG", optimize=True)
+    return image_cache.put(f"{key}.{extension}", save)
+
+
+if __name__ == "__main__":
+    path = prepare_image(sys.argv[1], float(sys.argv[2]), float(sys.argv[3]))
+    print("Saved at:", path)
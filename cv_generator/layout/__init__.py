@@ -0,0 +1,7 @@
+from .measure import iter_pages, measure_cv, measure_left, measure_right
+from .nodes import Box, Image, Line, Node, Paragraph, Rect, Text, from_dict, to_dict
+from .paginate import paginate
+from .paragraph_cache import ParagraphCache, paragraph_cache
+from .render import render_layout
+from .section_cache import SectionCache, section_cache
+from .template import DEFAULT_TEMPLATE, RenderPlan, compile_template, load_template
@@ -0,0 +1,594 @@
+import os
+from typing import Iterator
+
+from reportlab.pdfbase import pdfmetrics
+
+from ..draw import write_text
+from ..graphics import prepare_image
+from ..util.i18n import catalog, catalog_digest, localize
+from ..util.profiling import span
+from ..util.styles import get_style, style_registry
+from .nodes import Box, Image, Line, Node, Paragraph, Rect, Text
+from .paginate import paginate
+from .paragraph_cache import paragraph_cache
+from .section_cache import section_cache
+from .template import RenderPlan, Section, load_template
+
+
+class TextRecorder:
+    """Stands in for a `PDFTextObject` and records the calls made on it."""
+
+    _charSpace = 0
+
+    def __init__(self, x: float = 0, y: float = 0):
+        self._x0 = self._x = x
+        self._y = y
+        self._fontname = None
+        self._fontsize = None
+        self._leading = 0
+        self.ops = list()
+
+    def getX(self) -> float:
+        return self._x
+
+    def getY(self) -> float:
+        return self._y
+
+    def setFont(self, psfontname: str, size: float, leading: float = None):
+        self._fontname = psfontname
+        self._fontsize = size
+        self._leading = size * 1.2 if leading is None else leading
+        self.ops.append(("font", psfontname, size, leading))
+
+    def textOut(self, text: str):
+        self._x += pdfmetrics.stringWidth(text, self._fontname, self._fontsize)
+        self.ops.append(("out", text))
+
+    def textLine(self, text: str = ""):
+        self._x = self._x0
+        self._y -= self._leading
+        self.ops.append(("line", text))
+
+
+def measure_text(
+    x: float, y: float, text: str, face_name: str, font_size: int, color, **kwargs
+) -> Text:
+    recorder = TextRecorder(x)
+    width, height = write_text(recorder, text, face_name, font_size, **kwargs)
+    return Text(x, y, width, height, color, recorder.ops)
+
+
+def measure_paragraph(
+    x: float,
+    y: float,
+    text: str,
+    width: float,
+    style_name: str,
+    style: dict,
+    bullet_text: str = None,
+) -> Paragraph:
+    flowable = paragraph_cache.get(
+        text, width, style_registry.get(style_name, style), bullet_text
+    )
+    return Paragraph(
+        x, y, width, flowable.height, text, style_name, style, bullet_text, flowable
+    )
+
+
+def measure_styled_text(
+    x: float, y: float, text: str, face_name: str, spec: dict
+) -> Text:
+    """Measures `text` with the font size, color and wrapping of a template."""
+    return measure_text(
+        x,
+        y,
+        text,
+        face_name,
+        spec["font_size"],
+        spec["color"],
+        max_width=spec.get("max_width"),
+        end_right=spec.get("end_right"),
+        style={"small-caps": True} if spec.get("small_caps") else {},
+    )
+
+
+def section_data(section: Section, data: dict):
+    """Returns the part of `data` that `section` is measured from."""
+    if "fields" in section.spec:
+        return [data.get(name) for name in section.spec["fields"]]
+    return data.get(section.spec["field"])
+
+
+def measure_sidebar_header(
+    section: Section, face_name: str, lang: str, plan: RenderPlan
+) -> list[Node]:
+    header = plan.left.spec["header"]
+    rect, icon, title = header["rect"], header["icon"], header["title"]
+    return [
+        Rect(rect.get("x", 0), rect["y"], rect["width"], rect["height"], rect["color"]),
+        Image(
+            icon["x"],
+            icon["y"],
+            icon["size"],
+            icon["size"],
+            section.spec["icon"],
+            mask="auto",
+        ),
+        measure_styled_text(
+            title["x"], title["y"], catalog(lang)[section.name], face_name, title
+        ),
+    ]
+
+
+def measure_text_section(
+    section: Section, data: dict, face_name: str, lang: str, plan: RenderPlan
+) -> Box:
+    spec = section.spec
+    text = measure_styled_text(
+        spec["x"],
+        spec["top"] + spec["font_size"] + spec["y"],
+        data[spec["field"]],
+        face_name,
+        spec,
+    )
+    return Box(
+        0,
+        0,
+        plan.left.width,
+        spec["top"] + text.height + spec["bottom"],
+        section.name,
+        [*measure_sidebar_header(section, face_name, lang, plan), text],
+    )
+
+
+def measure_links(
+    section: Section, data: dict, face_name: str, lang: str, plan: RenderPlan
+) -> Box:
+    spec = section.spec
+    paragraph = measure_paragraph(
+        spec["x"],
+        spec["y"],
+        spec["separator"].join(
+            spec["format"].format(value)
+            for value in section_data(section, data)
+            if value
+        ),
+        spec["width"],
+        section.name,
+        get_style(plan.styles[spec["style"]], fontName=face_name),
+    )
+    return Box(
+        0,
+        0,
+        plan.left.width,
+        spec["top"] + paragraph.height + spec["bottom"],
+        section.name,
+        [*measure_sidebar_header(section, face_name, lang, plan), paragraph],
+    )
+
+
+def measure_languages(
+    section: Section, data: dict, face_name: str, lang: str, plan: RenderPlan
+) -> Box:
+    spec = section.spec
+    strings = catalog(lang)
+    box = Box(
+        0,
+        0,
+        plan.left.width,
+        0,
+        section.name,
+        measure_sidebar_header(section, face_name, lang, plan),
+    )
+    y = spec["top"]
+    for language in data[spec["field"]]:
+        paragraph = measure_paragraph(
+            spec["x"],
+            y + spec["spacing"],
+            f"{strings['language_codes'][language['language']]}: {strings['language_level'][language['fluency']]}".replace(
+                "\n", "<br/>"
+            ).replace(
+                "/", " / "
+            ),
+            spec["width"],
+            f"{section.name}-list",
+            get_style(plan.styles[spec["style"]], fontName=face_name),
+            spec["bullet"],
+        )
+        box.children.append(paragraph)
+        y += spec["spacing"] + paragraph.height
+    box.height = y + spec.get("bottom", 0)
+    return box
+
+
+left_sections = {
+    "text": measure_text_section,
+    "links": measure_links,
+    "languages": measure_languages,
+}
+
+
+def measure_portrait(
+    section: Section, data: dict, data_path: str, image_dpi: int, plan: RenderPlan
+) -> Box:
+    spec = section.spec
+    with span("prepare_image"):
+        img = prepare_image(
+            os.path.join(os.path.dirname(data_path), data[spec["field"]]),
+            spec["size"],
+            spec["size"],
+            image_dpi,
+        )
+    return Box(
+        0,
+        0,
+        plan.left.width,
+        spec["y"] + spec["size"],
+        section.name,
+        [Image(spec["x"], spec["y"], spec["size"], spec["size"], img, "circle")],
+    )
+
+
+def measure_left(
+    data: dict,
+    data_path: str,
+    face_name: str,
+    lang: str,
+    include_watermark: bool = True,
+    image_dpi: int = 300,
+    plan: RenderPlan = None,
+) -> Box:
+    plan = plan or load_template()
+    column = measure_sidebar(face_name, lang, False, plan)
+
+    y_pos = 0
+    for section in plan.left.sections:
+        if section.type == "portrait":
+            box = measure_portrait(section, data, data_path, image_dpi, plan)
+            box.y = y_pos
+        else:
+            box = section_cache.get(
+                section.name,
+                y_pos,
+                lambda: left_sections[section.type](
+                    section, data, face_name, lang, plan
+                ),
+                section_data(section, data),
+                face_name,
+                lang,
+                plan.digest,
+                catalog_digest(),
+            )
+        column.children.append(box)
+        y_pos += box.height
+
+    if include_watermark and "watermark" in plan.left.spec:
+        column.children.append(measure_watermark(face_name, lang, plan))
+
+    return column
+
+
+def measure_watermark(face_name: str, lang: str, plan: RenderPlan) -> Text:
+    spec = plan.left.spec["watermark"]
+    return measure_styled_text(
+        spec["x"],
+        plan.page_height - spec["bottom"],
+        catalog(lang)["watermark"],
+        face_name,
+        spec,
+    )
+
+
+def measure_sidebar(
+    face_name: str, lang: str, include_watermark: bool = True, plan: RenderPlan = None
+) -> Box:
+    """Measures the left column of the pages after the first one."""
+    plan = plan or load_template()
+    column = Box(plan.left.x, 0, plan.left.width, plan.page_height, "left")
+    if "background" in plan.left.spec:
+        column.children.append(
+            Rect(0, 0, plan.left.width, plan.page_height, plan.left.spec["background"])
+        )
+    if include_watermark and "watermark" in plan.left.spec:
+        column.children.append(measure_watermark(face_name, lang, plan))
+    return column
+
+
+def measure_entry(
+    title: str,
+    subtitle: str,
+    items: list[str],
+    face_name: str,
+    plan: RenderPlan,
+    style_name: str = "education-list",
+) -> Box:
+    spec = plan.right.spec["entry"]
+    x = spec["x"]
+    entry = Box(0, 0, plan.right.width, 0, "entry")
+
+    y = spec["top"] + spec["title"]["font_size"]
+    entry.children.append(
+        measure_styled_text(
+            x,
+            y,
+            title,
+            face_name,
+            {**spec["title"], "max_width": plan.right.width - 2 * x},
+        )
+    )
+
+    if subtitle is not None:
+        subtitle_spec = spec["subtitle"]
+        y += subtitle_spec["spacing"] + subtitle_spec["font_size"]
+        recorder = TextRecorder(x)
+        recorder.setFont(face_name, subtitle_spec["font_size"])
+        recorder.textOut(subtitle)
+        entry.children.append(
+            Text(x, y, recorder.getX(), 0, subtitle_spec["color"], recorder.ops)
+        )
+
+    items_spec = spec["items"]
+    y += items_spec["spacing"]
+    for item in items:
+        paragraph = measure_paragraph(
+            x,
+            y + items_spec["spacing"],
+            item.replace("\n", "<br/>"),
+            plan.right.width - 2 * x - items_spec["indent"],
+            style_name,
+            get_style(plan.styles[items_spec["style"]], fontName=face_name),
+            items_spec["bullet"],
+        )
+        entry.children.append(paragraph)
+        y += items_spec["spacing"] + paragraph.height
+
+    entry.height = y
+    return entry
+
+
+def measure_section(title: str, face_name: str, name: str, plan: RenderPlan) -> Box:
+    spec = plan.right.spec["title"]
+    section = Box(0, 0, plan.right.width, 0, name)
+
+    y = spec["top"] + spec["font_size"]
+    title_text = measure_styled_text(spec["x"], y, title, face_name, spec)
+    section.children.append(title_text)
+    section.children.append(
+        Line(
+            spec["x"],
+            y + spec["underline"],
+            spec["x"] + title_text.width,
+            y + spec["underline"],
+            spec["color"],
+        )
+    )
+
+    section.height = y + spec["underline"]
+    return section
+
+
+def format_date(entry: dict) -> str:
+    return (
+        entry["start"] if "end" not in entry else f"{entry['start']} - {entry['end']}"
+    )
+
+
+def measure_header(
+    section: Section, data: dict, face_name: str, lang: str, plan: RenderPlan
+) -> Box:
+    spec = section.spec
+    rect, full_name, headline = spec["rect"], spec["full_name"], spec["headline"]
+    name, headline_text = section_data(section, data)
+
+    rect_width = plan.right.width - rect["margin"]
+    recorder = TextRecorder(full_name["x"])
+    name_text_width, _ = write_text(
+        recorder,
+        name["first"],
+        face_name,
+        full_name["font_size"],
+        max_width=rect_width - 2 * full_name["x"],
+        style={"small-caps": full_name.get("small_caps", False)},
+    )
+    recorder.textOut(" ")
+    write_text(
+        recorder,
+        name["last"],
+        face_name,
+        full_name["font_size"],
+        max_width=rect_width - 2 * full_name["x"] - name_text_width,
+        style={"small-caps": full_name.get("small_caps", False)},
+    )
+    return Box(
+        0,
+        0,
+        plan.right.width,
+        rect["y"] + rect["height"],
+        section.name,
+        [
+            Rect(
+                rect.get("x", 0), rect["y"], rect_width, rect["height"], rect["color"]
+            ),
+            Text(
+                full_name["x"],
+                full_name["y"],
+                recorder.getX() - full_name["x"],
+                0,
+                full_name["color"],
+                recorder.ops,
+            ),
+            measure_styled_text(
+                headline["x"],
+                headline["y"],
+                headline_text,
+                face_name,
+                {**headline, "max_width": rect_width - 2 * headline["x"]},
+            ),
+        ],
+    )
+
+
+def measure_list(
+    section: Section, data: dict, face_name: str, lang: str, plan: RenderPlan
+) -> Box:
+    spec = section.spec
+    box = measure_entry(
+        catalog(lang)[section.name],
+        None,
+        [item[spec["item_key"]] for item in data[spec["field"]]],
+        face_name,
+        plan,
+        f"{section.name}-list",
+    )
+    box.name = section.name
+    return box
+
+
+right_sections = {
+    "header": measure_header,
+    "list": measure_list,
+}
+
+
+def iter_entries(
+    section: Section, data: dict, face_name: str, lang: str, plan: RenderPlan
+) -> Iterator[Box]:
+    """Yields the title of the section followed by each of its entries."""
+    spec = plan.right.spec["entry"]
+    title_key, subtitle_key = section.spec["title_key"], section.spec["subtitle_key"]
+    yield section_cache.get(
+        section.name,
+        0,
+        lambda: measure_section(
+            catalog(lang)[section.name], face_name, section.name, plan
+        ),
+        face_name,
+        lang,
+        plan.digest,
+        catalog_digest(),
+    )
+    for entry in data[section.spec["field"]]:
+        yield section_cache.get(
+            "entry",
+            0,
+            lambda: measure_entry(
+                entry[title_key],
+                f"{entry[subtitle_key]}{spec['subtitle']['separator']}{format_date(entry)}",
+                entry["tasks"],
+                face_name,
+                plan,
+            ),
+            entry,
+            title_key,
+            subtitle_key,
+            face_name,
+            lang,
+            plan.digest,
+            catalog_digest(),
+        )
+
+
+def iter_right(
+    data: dict, face_name: str, lang: str, plan: RenderPlan = None
+) -> Iterator[Box]:
+    """Yields the sections of the right column in order, each placed at 0.
+
+    Like the other measure functions, this expects `data` to be resolved for
+    `lang` by `localize`.
+    """
+    plan = plan or load_template()
+    for section in plan.right.sections:
+        if section.type == "entries":
+            yield from iter_entries(section, data, face_name, lang, plan)
+            continue
+        if section.type == "list" and not section_data(section, data):
+            continue
+        yield section_cache.get(
+            section.name,
+            0,
+            lambda: right_sections[section.type](section, data, face_name, lang, plan),
+            section_data(section, data),
+            face_name,
+            lang,
+            plan.digest,
+            catalog_digest(),
+        )
+
+
+def measure_right(
+    data: dict, data_path: str, face_name: str, lang: str, plan: RenderPlan = None
+) -> Box:
+    """Measures the right column as a single page, regardless of its height."""
+    plan = plan or load_template()
+    column = Box(plan.right.x, 0, plan.right.width, plan.page_height, "right")
+    y_pos = 0
+    for section in iter_right(data, face_name, lang, plan):
+        section.y = y_pos
+        column.children.append(section)
+        y_pos += section.height
+    return column
+
+
+def iter_pages(
+    data: dict,
+    data_path: str,
+    face_name: str,
+    lang: str,
+    include_watermark: bool = True,
+    image_dpi: int = 300,
+    repeat_sidebar: bool = False,
+    plan: RenderPlan = None,
+) -> Iterator[Box]:
+    """Measures the CV page by page into layout trees `render_layout` can draw.
+
+    The right column is split across as many pages as it needs. The following
+    pages continue the sidebar without its content, unless `repeat_sidebar`
+    is set. Pages are measured as they are requested.
+
+    `plan` is the compiled template to lay the CV out with, see
+    `load_template`. It defaults to `DEFAULT_TEMPLATE`.
+    """
+    plan = plan or load_template()
+    data = localize(data, lang)
+    with span("left"):
+        left = measure_left(
+            data, data_path, face_name, lang, include_watermark, image_dpi, plan
+        )
+    pages = paginate(
+        iter_right(data, face_name, lang, plan),
+        plan.page_height,
+        plan.top,
+        plan.bottom,
+    )
+    for number, sections in enumerate(pages):
+        if number == 1 and not repeat_sidebar:
+            left = measure_sidebar(face_name, lang, include_watermark, plan)
+        right = Box(
+            plan.right.x, 0, plan.right.width, plan.page_height, "right", sections
+        )
+        yield Box(0, 0, plan.page_width, plan.page_height, "page", [left, right])
+
+
+def measure_cv(
+    data: dict,
+    data_path: str,
+    face_name: str,
+    lang: str,
+    include_watermark: bool = True,
+    image_dpi: int = 300,
+    repeat_sidebar: bool = False,
+    plan: RenderPlan = None,
+) -> list[Box]:
+    """Measures every page of the CV, see `iter_pages`."""
+    return list(
+        iter_pages(
+            data,
+            data_path,
+            face_name,
+            lang,
+            include_watermark,
+            image_dpi,
+            repeat_sidebar,
+            plan,
+        )
+    )
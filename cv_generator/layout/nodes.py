@@ -0,0 +1,131 @@
+from dataclasses import dataclass, field, fields
+from typing import ClassVar, Optional
+
+from reportlab.lib import colors
+
+# Positions are measured in points from the top-left corner of the parent
+# box, with y growing downwards.
+
+
+@dataclass
+class Node:
+    kind: ClassVar[str]
+
+    x: float
+    y: float
+
+
+@dataclass
+class Box(Node):
+    kind = "box"
+
+    width: float
+    height: float
+    name: Optional[str] = None
+    children: list[Node] = field(default_factory=list)
+
+
+@dataclass
+class Rect(Node):
+    kind = "rect"
+
+    width: float
+    height: float
+    color: tuple[float, float, float]
+
+
+@dataclass
+class Image(Node):
+    kind = "image"
+
+    width: float
+    height: float
+    path: str
+    clip: Optional[str] = None
+    mask: Optional[str] = None
+
+
+@dataclass
+class Line(Node):
+    kind = "line"
+
+    x2: float
+    y2: float
+    color: tuple[float, float, float]
+    line_width: float = 1
+
+
+@dataclass
+class Text(Node):
+    """A text object, `y` is the baseline of the first line.
+
+    `ops` are the `setFont`, `textOut` and `textLine` calls recorded while
+    measuring the text, so rendering needs no further measurement.
+    """
+
+    kind = "text"
+
+    width: float
+    height: float
+    color: tuple[float, float, float]
+    ops: list[tuple] = field(default_factory=list)
+
+
+@dataclass
+class Paragraph(Node):
+    kind = "paragraph"
+
+    width: float
+    height: float
+    text: str
+    style_name: str
+    style: dict
+    bullet_text: Optional[str] = None
+    # The wrapped flowable from measuring, not serialised.
+    flowable: object = field(default=None, repr=False, compare=False)
+
+
+node_types: dict[str, type[Node]] = {
+    node_type.kind: node_type for node_type in (Box, Rect, Image, Line, Text, Paragraph)
+}
+
+
+def _encode(value):
+    if isinstance(value, colors.Color):
+        return value.hexval()
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, Node):
+        return to_dict(value)
+    return value
+
+
+def to_dict(node: Node) -> dict:
+    """Serialises a layout tree to JSON compatible dicts."""
+    return {
+        "kind": node.kind,
+        **{
+            f.name: _encode(getattr(node, f.name))
+            for f in fields(node)
+            if f.name != "flowable"
+        },
+    }
+
+
+def from_dict(data: dict) -> Node:
+    data = dict(data)
+    node_type = node_types[data.pop("kind")]
+    if node_type is Box:
+        data["children"] = [from_dict(child) for child in data["children"]]
+    elif node_type is Paragraph:
+        data["style"] = {
+            k: colors.HexColor(v) if k.endswith("Color") and isinstance(v, str) else v
+            for k, v in data["style"].items()
+        }
+    elif node_type is Text:
+        data["ops"] = [tuple(op) for op in data["ops"]]
+    if "color" in data:
+        data["color"] = tuple(data["color"])
+    return node_type(**data)
@@ -0,0 +1,88 @@
+import dataclasses
+from typing import Iterable, Iterator
+
+from .nodes import Box, Paragraph
+
+
+def break_points(box: Box) -> list[int]:
+    """Returns the indices of the children `box` may be split before.
+
+    Boxes are split between paragraphs only, and never before the first one
+    so that titles stay with at least one item.
+    """
+    points = list()
+    seen_paragraph = False
+    for i, child in enumerate(box.children):
+        if isinstance(child, Paragraph):
+            if seen_paragraph:
+                points.append(i)
+            seen_paragraph = True
+    return points
+
+
+def _piece(box: Box, y: float, start: int, end: int, offset: float) -> Box:
+    if start == 0 and end == len(box.children):
+        return dataclasses.replace(box, y=y)
+    # The piece is moved up by `offset` instead of moving every child down, so
+    # the children keep their positions and can be shared with the cache.
+    bottom = box.children[end].y if end < len(box.children) else box.height
+    return Box(box.x, y - offset, box.width, bottom, box.name, box.children[start:end])
+
+
+def paginate(
+    sections: Iterable[Box],
+    page_height: float,
+    top: float,
+    bottom: float,
+    first_top: float = 0,
+) -> Iterator[list[Box]]:
+    """Stacks `sections` and yields the ones placed on each page.
+
+    The first page starts at `first_top`, the following ones at `top`, and
+    nothing is placed below `page_height - bottom`. Sections that don't fit
+    are split at their `break_points` or moved to the next page. A section
+    that doesn't fit on an empty page either is placed anyway.
+
+    `sections` are consumed lazily and every page is yielded as soon as it is
+    full, so only one page is held at a time.
+    """
+    limit = page_height - bottom
+    page = list()
+    y = first_top
+    for section in sections:
+        children = section.children
+        points = break_points(section)
+        # Index into `points` and the first child and offset not placed yet.
+        next_point = 0
+        start = 0
+        offset = 0
+        while True:
+            if y + section.height - offset <= limit:
+                page.append(_piece(section, y, start, len(children), offset))
+                y += section.height - offset
+                break
+
+            end = None
+            while (
+                next_point < len(points)
+                and y + children[points[next_point]].y - offset <= limit
+            ):
+                end = points[next_point]
+                next_point += 1
+            if end is None and not page:
+                if next_point == len(points):
+                    page.append(_piece(section, y, start, len(children), offset))
+                    y += section.height - offset
+                    break
+                end = points[next_point]
+                next_point += 1
+
+            if end is not None:
+                page.append(_piece(section, y, start, end, offset))
+                start = end
+                offset = children[end].y
+            yield page
+            page = list()
+            y = top
+    if page:
+        yield page
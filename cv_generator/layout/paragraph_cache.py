@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph as ParagraphFlowable
+
+
+class ParagraphCache:
+    """Keeps parsed and wrapped paragraphs in memory.
+
+    Paragraphs are keyed on their text, bullet, style and the width they are
+    wrapped to, so bullets that recur across entries and CVs are only parsed
+    and wrapped once. Styles are compared by identity, so they should come
+    from `style_registry`. At most `max_entries` paragraphs are kept, the
+    least recently used are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.paragraphs: OrderedDict[tuple, ParagraphFlowable] = OrderedDict()
+        # Guards the order of `paragraphs`, wrapping happens outside of it.
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        text: str,
+        width: float,
+        style: ParagraphStyle,
+        bullet_text: str = None,
+    ) -> ParagraphFlowable:
+        """Returns the paragraph wrapped to `width`, its height is `.height`.
+
+        The flowable is shared and must not be wrapped to another width.
+        """
+        key = (text, bullet_text, width, style)
+        with self.lock:
+            flowable = self.paragraphs.get(key)
+            if flowable is not None:
+                self.hits += 1
+                self.paragraphs.move_to_end(key)
+                return flowable
+
+        flowable = ParagraphFlowable(text, bulletText=bullet_text, style=style)
+        flowable.wrap(width, 0)
+        with self.lock:
+            self.misses += 1
+            self.paragraphs[key] = flowable
+            while len(self.paragraphs) > self.max_entries:
+                self.paragraphs.popitem(last=False)
+        return flowable
+
+    def clear(self):
+        with self.lock:
+            self.paragraphs.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.paragraphs),
+            "max_entries": self.max_entries,
+        }
+
+
+paragraph_cache = ParagraphCache()
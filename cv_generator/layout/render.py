@@ -0,0 +1,82 @@
+import copy
+
+from reportlab.pdfgen import canvas
+
+from ..draw import draw_circle_image
+from ..graphics import load_image
+from ..util.profiling import span
+from ..util.styles import style_registry
+from .nodes import Box, Image, Line, Node, Paragraph, Rect, Text
+from .paragraph_cache import paragraph_cache
+
+
+def _image(path: str):
+    # JPEGs are passed through by path so reportlab embeds them without decoding.
+    return path if path.endswith(".jpg") else load_image(path)
+
+
+def render_layout(doc: canvas.Canvas, node: Node, x: float = 0, y: float = 0):
+    """Draws a layout tree from `measure_cv` onto `doc`.
+
+    `x` and `y` are the offset of the parent box from the top-left corner of
+    the page.
+    """
+    page_height = doc._pagesize[1]
+    parent_x, parent_y = x, y
+    x += node.x
+    y += node.y
+
+    if isinstance(node, Box):
+        with span(node.name or "box"):
+            for child in node.children:
+                render_layout(doc, child, x, y)
+    elif isinstance(node, Rect):
+        doc.setStrokeColorRGB(*node.color)
+        doc.setFillColorRGB(*node.color)
+        doc.rect(x, page_height - y - node.height, node.width, node.height, fill=1)
+    elif isinstance(node, Image):
+        if node.clip == "circle":
+            draw_circle_image(
+                doc, _image(node.path), x, page_height - y - node.height, node.width
+            )
+        else:
+            doc.drawImage(
+                _image(node.path),
+                x,
+                page_height - y - node.height,
+                width=node.width,
+                height=node.height,
+                mask=node.mask,
+            )
+    elif isinstance(node, Line):
+        doc.setStrokeColorRGB(*node.color)
+        doc.setLineWidth(node.line_width)
+        doc.line(
+            x,
+            page_height - y,
+            parent_x + node.x2,
+            page_height - parent_y - node.y2,
+        )
+    elif isinstance(node, Text):
+        text_object = doc.beginText(x, page_height - y)
+        text_object.setFillColorRGB(*node.color)
+        for op, *args in node.ops:
+            if op == "font":
+                text_object.setFont(*args)
+            elif op == "out":
+                text_object.textOut(*args)
+            elif op == "line":
+                text_object.textLine(*args)
+        doc.drawText(text_object)
+    elif isinstance(node, Paragraph):
+        flowable = node.flowable or paragraph_cache.get(
+            node.text,
+            node.width,
+            style_registry.get(node.style_name, node.style),
+            node.bullet_text,
+        )
+        # Cached flowables are shared between threads and drawing sets the
+        # canvas on them, so every draw gets its own shallow copy.
+        copy.copy(flowable).drawOn(doc, x, page_height - y - node.height)
+    else:
+        raise TypeError(f"Cannot render layout node {node!r}")
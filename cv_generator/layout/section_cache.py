@@ -0,0 +1,70 @@
+import dataclasses
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from ..util.profiling import span
+from .nodes import Box
+
+
+class SectionCache:
+    """Keeps measured sections of the layout tree in memory.
+
+    Sections are keyed on a hash of the data they are measured from, so a
+    section is only measured again once its own data, the language, the font
+    or the style change. At most `max_entries` sections are kept, the least
+    recently used are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.sections: OrderedDict[str, Box] = OrderedDict()
+        # Guards the order of `sections`, measuring happens outside of it.
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(name: str, *args) -> str:
+        return hashlib.sha256(
+            json.dumps([name, *args], sort_keys=True, default=repr).encode("utf8")
+        ).hexdigest()
+
+    def get(self, name: str, y: float, measure: Callable[[], Box], *args) -> Box:
+        """Returns the section measured by `measure` placed at `y`.
+
+        `args` must include everything `measure` depends on. The cached box is
+        shared between layouts, only its position is copied.
+        """
+        with span(name):
+            key = self.key(name, *args)
+            with self.lock:
+                section = self.sections.get(key)
+                if section is not None:
+                    self.hits += 1
+                    self.sections.move_to_end(key)
+            if section is None:
+                section = measure()
+                with self.lock:
+                    self.misses += 1
+                    self.sections[key] = section
+                    while len(self.sections) > self.max_entries:
+                        self.sections.popitem(last=False)
+            return dataclasses.replace(section, y=y)
+
+    def clear(self):
+        with self.lock:
+            self.sections.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.sections),
+            "max_entries": self.max_entries,
+        }
+
+
+section_cache = SectionCache()
@@ -0,0 +1,212 @@
+import copy
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+from reportlab.lib import colors, pagesizes, units
+
+DEFAULT_TEMPLATE = os.path.join("assets", "templates", "default.json")
+
+# Sections each column can hold, see `measure.py` for what they draw.
+LEFT_SECTIONS = ("portrait", "text", "links", "languages")
+RIGHT_SECTIONS = ("header", "entries", "list")
+
+# Options that are lengths, given in points or as strings with a unit such as
+# "0.5cm", and options that are colors, given as a name from the template's
+# colors, "#rrggbb" or a list of RGB values from 0 to 255.
+LENGTH_KEYS = frozenset(
+    {
+        "x",
+        "y",
+        "width",
+        "height",
+        "size",
+        "top",
+        "bottom",
+        "spacing",
+        "indent",
+        "margin",
+        "max_width",
+        "end_right",
+        "underline",
+    }
+)
+COLOR_KEYS = frozenset({"color", "background", "textColor", "bulletColor"})
+
+
+@dataclass
+class Section:
+    type: str
+    name: str
+    spec: dict
+
+
+@dataclass
+class Column:
+    x: float
+    width: float
+    sections: list[Section]
+    # The column's other options with lengths and colors compiled.
+    spec: dict = field(default_factory=dict)
+
+
+@dataclass
+class RenderPlan:
+    """A compiled template, shared by every CV rendered with it.
+
+    Lengths are in points, colors are RGB tuples from 0 to 1 and styles are
+    keyword arguments for `ParagraphStyle`. `digest` identifies the template
+    in the section cache.
+    """
+
+    page_size: tuple[float, float]
+    top: float
+    bottom: float
+    left: Column
+    right: Column
+    styles: dict[str, dict]
+    digest: str
+
+    @property
+    def page_width(self) -> float:
+        return self.page_size[0]
+
+    @property
+    def page_height(self) -> float:
+        return self.page_size[1]
+
+
+def _length(value) -> float:
+    return float(value) if isinstance(value, (int, float)) else units.toLength(value)
+
+
+def _color(value, palette: dict) -> tuple[float, float, float]:
+    if isinstance(value, str) and value in palette:
+        return palette[value]
+    if isinstance(value, str):
+        return colors.HexColor(value).rgb()
+    return tuple(channel / 255 for channel in value)
+
+
+def _compile(value, palette: dict, key: str = None):
+    if isinstance(value, dict):
+        return {k: _compile(v, palette, k) for k, v in value.items()}
+    if isinstance(value, list) and key not in COLOR_KEYS:
+        return [_compile(v, palette) for v in value]
+    if key in LENGTH_KEYS:
+        return _length(value)
+    if key in COLOR_KEYS:
+        return _color(value, palette)
+    return value
+
+
+def _compile_styles(styles: dict, palette: dict) -> dict[str, dict]:
+    compiled = dict()
+
+    def resolve(name: str, seen: tuple = ()) -> dict:
+        if name in compiled:
+            return compiled[name]
+        if name not in styles or name in seen:
+            raise ValueError(f"Unknown or circular style: {name}")
+        style = dict(styles[name])
+        parent = style.pop("parent", None)
+        for key in COLOR_KEYS & style.keys():
+            style[key] = colors.Color(*_color(style[key], palette))
+        compiled[name] = {**(resolve(parent, (*seen, name)) if parent else {}), **style}
+        return compiled[name]
+
+    for name in styles:
+        resolve(name)
+    return compiled
+
+
+def _compile_sections(
+    specs: list[dict], allowed: tuple[str, ...], palette: dict, base_dir: str
+) -> list[Section]:
+    sections = list()
+    for spec in specs:
+        spec = _compile(spec, palette)
+        section_type = spec.pop("type", None)
+        if section_type not in allowed:
+            raise ValueError(
+                f"Unknown section type {section_type!r}, expected one of {allowed}"
+            )
+        if "icon" in spec:
+            spec["icon"] = os.path.normpath(os.path.join(base_dir, spec["icon"]))
+        sections.append(Section(section_type, spec.pop("name", section_type), spec))
+    return sections
+
+
+def compile_template(template: dict, base_dir: str = ".") -> RenderPlan:
+    """Compiles a template into a plan that `iter_pages` lays CVs out with.
+
+    Icons are resolved relative to `base_dir`, the template's directory.
+    Raises `ValueError` for unknown section types and styles.
+    """
+    template = copy.deepcopy(template)
+    palette = {
+        name: _color(value, {}) for name, value in template.get("colors", {}).items()
+    }
+
+    page = template.get("page", {})
+    size = page.get("size", "A4")
+    page_size = (
+        getattr(pagesizes, size.upper())
+        if isinstance(size, str)
+        else tuple(_length(v) for v in size)
+    )
+
+    left = _compile(template["left"], palette)
+    right = _compile(template["right"], palette)
+    left_width = left.pop("width")
+    right_width = right.pop("width", page_size[0] - left_width)
+
+    return RenderPlan(
+        page_size,
+        _length(page.get("top", 0)),
+        _length(page.get("bottom", 0)),
+        Column(
+            0,
+            left_width,
+            _compile_sections(
+                template["left"]["sections"], LEFT_SECTIONS, palette, base_dir
+            ),
+            {k: v for k, v in left.items() if k != "sections"},
+        ),
+        Column(
+            left_width,
+            right_width,
+            _compile_sections(
+                template["right"]["sections"], RIGHT_SECTIONS, palette, base_dir
+            ),
+            {k: v for k, v in right.items() if k != "sections"},
+        ),
+        _compile_styles(template.get("styles", {}), palette),
+        hashlib.sha256(
+            json.dumps([template, base_dir], sort_keys=True).encode("utf8")
+        ).hexdigest(),
+    )
+
+
+_plans: dict[str, tuple[tuple[int, int], RenderPlan]] = dict()
+
+
+def load_template(path: Optional[str] = None) -> RenderPlan:
+    """Loads and compiles a template file, `DEFAULT_TEMPLATE` if `path` is None.
+
+    Plans are kept per file and only compiled again once it changes on disk.
+    """
+    path = path or DEFAULT_TEMPLATE
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _plans.get(os.path.abspath(path))
+    if cached and cached[0] == key:
+        return cached[1]
+
+    with open(path, encoding="utf8") as f:
+        plan = compile_template(json.load(f), os.path.dirname(path))
+    _plans[os.path.abspath(path)] = (key, plan)
+    return plan
@@ -1,16 +1,33 @@
-import json
+import io
+import logging
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from typing import BinaryIO, Iterator, Optional
 
-from reportlab.lib import colors, pagesizes, styles, units
-from reportlab.pdfbase import pdfmetrics
+from reportlab import rl_config
 from reportlab.pdfgen import canvas
-from reportlab.platypus import Paragraph
 
-from .draw import write_text
-from .graphics.crop_to_circle import crop_to_circle
-from .util.i18n import resolve_string, strings
-from .util.styles import get_style, list_style
+from .layout import (
+    Box,
+    RenderPlan,
+    iter_pages,
+    load_template,
+    measure_cv,
+    measure_left,
+    measure_right,
+    render_layout,
+)
+from .util.build import BuildManifest, get_build_date, input_hash
+from .util.data import load_data
+from .util.file_cache import atomic_path
+from .util.fonts import register_font
+from .util.i18n import localize
+from .util.profiling import Profiler, is_profiling, span
+
+logger = logging.getLogger(__name__)
 
 
 def draw_left(
@@ -20,506 +37,407 @@ def draw_left(
     face_name: str,
     lang: str,
     include_watermark: bool = True,
+    image_dpi: int = 300,
+    plan: RenderPlan = None,
 ):
-    y_pos = 0
-
-    def draw_cursor():
-        doc.line(0, y_pos, 8 * units.cm, y_pos)
-
-    doc.setStrokeColorRGB(167 / 255, 174 / 255, 177 / 255)
-    doc.setFillColorRGB(167 / 255, 174 / 255, 177 / 255)
-    doc.rect(0, 0, 8 * units.cm, pagesizes.A4[1], fill=1)
-
-    img = crop_to_circle(os.path.join(os.path.dirname(data_path), data["img"]))
-    y = 6 * units.cm + 1 * units.cm
-    doc.drawImage(
-        img,
-        1 * units.cm,
-        pagesizes.A4[1] - y,
-        width=6 * units.cm,
-        height=6 * units.cm,
-        mask="auto",
-    )
-
-    y_pos += y
-
-    doc.setStrokeColorRGB(42 / 255, 56 / 255, 72 / 255)
-    doc.setFillColorRGB(42 / 255, 56 / 255, 72 / 255)
-    doc.rect(
-        0,
-        pagesizes.A4[1] - y_pos - 2.5 * units.cm,
-        7 * units.cm,
-        1.5 * units.cm,
-        fill=1,
-    )
-
-    y_pos += 1.5 * units.cm
-
-    doc.drawImage(
-        os.path.join("assets", "icons", "manager.png"),
-        0.5 * units.cm,
-        pagesizes.A4[1] - y_pos - 0.75 * units.cm,
-        width=1 * units.cm,
-        height=1 * units.cm,
-        mask="auto",
-    )
-
-    profile_title = doc.beginText(
-        2 * units.cm,
-        pagesizes.A4[1] - y_pos - 0.5 * units.cm,
-    )
-    profile_title.setFillColorRGB(255 / 255, 255 / 255, 255 / 255)
-    write_text(
-        profile_title,
-        resolve_string(strings["profile"], lang),
-        face_name,
-        22,
-        max_width=7 * units.cm,
-        style={"small-caps": True},
-    )
-    doc.drawText(profile_title)
-
-    summary_text = doc.beginText(
-        0.5 * units.cm,
-        pagesizes.A4[1] - y_pos - 14 - 1.25 * units.cm,
-    )
-    _, height = write_text(
-        summary_text,
-        resolve_string(data["summary"], lang),
-        face_name,
-        14,
-        end_right=6.75 * units.cm,
-    )
-    doc.drawText(summary_text)
-
-    y_pos += height + 0.5 * units.cm
-
-    doc.setStrokeColorRGB(42 / 255, 56 / 255, 72 / 255)
-    doc.setFillColorRGB(42 / 255, 56 / 255, 72 / 255)
-    doc.rect(
-        0,
-        pagesizes.A4[1] - y_pos - 2.5 * units.cm,
-        7 * units.cm,
-        1.5 * units.cm,
-        fill=1,
+    render_layout(
+        doc,
+        measure_left(
+            localize(data, lang),
+            data_path,
+            face_name,
+            lang,
+            include_watermark,
+            image_dpi,
+            plan,
+        ),
     )
 
-    y_pos += 1.5 * units.cm
-
-    doc.drawImage(
-        os.path.join("assets", "icons", "message.png"),
-        0.5 * units.cm,
-        pagesizes.A4[1] - y_pos - 0.75 * units.cm,
-        width=1 * units.cm,
-        height=1 * units.cm,
-        mask="auto",
-    )
 
-    profile_title = doc.beginText(
-        2 * units.cm,
-        pagesizes.A4[1] - y_pos - 0.5 * units.cm,
-    )
-    profile_title.setFillColorRGB(255 / 255, 255 / 255, 255 / 255)
-    write_text(
-        profile_title,
-        resolve_string(strings["contact"], lang),
-        face_name,
-        22,
-        max_width=7 * units.cm,
-        style={"small-caps": True},
+def draw_right(
+    doc: canvas.Canvas,
+    data: dict,
+    data_path: str,
+    face_name: str,
+    lang: str,
+    plan: RenderPlan = None,
+):
+    render_layout(
+        doc, measure_right(localize(data, lang), data_path, face_name, lang, plan)
     )
-    doc.drawText(profile_title)
 
-    contact_addresses = list()
 
-    if data.get("phone"):
-        contact_addresses.append(data["phone"])
-    if data.get("email"):
-        contact_addresses.append(data["email"])
-    if data.get("website"):
-        contact_addresses.append(data["website"])
+def get_title(data: dict, lang: str, today: datetime = None) -> str:
+    today = today or datetime.today()
+    if data.get("title", None):
+        return data["title"].format(
+            firstname=data["name"]["first"],
+            lastname=data["name"]["first"],
+            date=today.strftime("%Y-%m-%d"),
+            lang=lang,
+        )
+    return f"CV_{data['name']['first']}_{data['name']['last']}"
 
-    paragraph = Paragraph(
-        "<br/><br/>".join(
-            f"<u>{contact_address}</u>" for contact_address in contact_addresses
-        ),
-        style=styles.ParagraphStyle(
-            "contact",
-            fontName=face_name,
-            fontSize=14,
-            textColor=colors.white,
-        ),
-    )
-    paragraph.wrapOn(doc, 6.75 * units.cm, 0)
-    paragraph.drawOn(
-        doc,
-        0.5 * units.cm,
-        pagesizes.A4[1] - y_pos - paragraph.height - 1.25 * units.cm,
-    )
-    y_pos += paragraph.height + 0.75 * units.cm
-
-    doc.setStrokeColorRGB(42 / 255, 56 / 255, 72 / 255)
-    doc.setFillColorRGB(42 / 255, 56 / 255, 72 / 255)
-    doc.rect(
-        0,
-        pagesizes.A4[1] - y_pos - 2.5 * units.cm,
-        7 * units.cm,
-        1.5 * units.cm,
-        fill=1,
-    )
 
-    y_pos += 2.5 * units.cm
+@contextmanager
+def open_output(path: Optional[str]) -> Iterator[BinaryIO]:
+    """Yields a stream for a PDF that is saved at `path` once complete.
 
-    doc.drawImage(
-        os.path.join("assets", "icons", "globe.png"),
-        0.5 * units.cm,
-        pagesizes.A4[1] - y_pos + 0.25 * units.cm,
-        width=1 * units.cm,
-        height=1 * units.cm,
-        mask="auto",
-    )
+    Without `path` the stream is an `io.BytesIO` that is left open.
+    """
+    if path is None:
+        yield io.BytesIO()
+        return
+    with atomic_path(path) as tmp, open(tmp, "wb") as f:
+        yield f
 
-    profile_title = doc.beginText(
-        2 * units.cm,
-        pagesizes.A4[1] - y_pos + 0.5 * units.cm,
-    )
-    profile_title.setFillColorRGB(255 / 255, 255 / 255, 255 / 255)
-    write_text(
-        profile_title,
-        resolve_string(strings["languages"], lang),
-        face_name,
-        22,
-        max_width=7 * units.cm,
-        style={"small-caps": True},
-    )
-    doc.drawText(profile_title)
-
-    for language in data["languages"]:
-        paragraph = Paragraph(
-            f"{resolve_string(strings['language_codes'][language['language']], lang)}: {resolve_string(strings['language_level'][language['fluency']], lang)}".replace(
-                "\n", "<br/>"
-            ).replace(
-                "/", " / "
-            ),
-            bulletText="•",
-            style=styles.ParagraphStyle(
-                "language-list",
-                **get_style(
-                    list_style,
-                    fontName=face_name,
-                    textColor=colors.white,
-                ),
-            ),
-        )
-        paragraph.wrapOn(doc, 6.5 * units.cm, 0)
-        paragraph.drawOn(
-            doc,
-            0.5 * units.cm,
-            pagesizes.A4[1] - y_pos - 0.2 * units.cm - paragraph.height,
-        )
-        y_pos += 0.2 * units.cm + paragraph.height
-
-    if include_watermark:
-        watermark = doc.beginText(0.5 * units.cm, 0.75 * units.cm)
-        watermark.setFillColorRGB(0 / 255, 0 / 255, 0 / 255)
-        write_text(
-            watermark,
-            resolve_string(strings["watermark"], lang),
-            face_name,
-            9,
-            6 * units.cm,
-        )
-        doc.drawText(watermark)
 
+def use_binary_streams(binary: bool = True):
+    """Embeds the streams of the PDFs rendered from now on as binary.
 
-def draw_right(
-    doc: canvas.Canvas, data: dict, data_path: str, face_name: str, lang: str
-):
-    y_pos = 0
-
-    def draw_cursor():
-        doc.line(8 * units.cm, y_pos, pagesizes.A4[0], y_pos)
-
-    doc.setStrokeColorRGB(42 / 255, 56 / 255, 72 / 255)
-    doc.setFillColorRGB(42 / 255, 56 / 255, 72 / 255)
-    y = pagesizes.A4[1] - 3.5 * units.cm - 1 * units.cm
-    name_rect_width = pagesizes.A4[0] - 8 * units.cm - 1 * units.cm
-    doc.rect(
-        8 * units.cm,
-        y,
-        name_rect_width,
-        3.5 * units.cm,
-        fill=1,
-    )
-
-    y_pos = y
+    reportlab's pure Python ASCII85 encoder otherwise takes up most of the
+    time of a warm render. The setting is process wide, scripts set it once
+    at startup and worker processes forked afterwards inherit it.
+    """
+    rl_config.useA85 = int(not binary)
 
-    name_text = doc.beginText(
-        8.5 * units.cm,
-        pagesizes.A4[1] - 2.5 * units.cm,
-    )
-    name_text.setFillColorRGB(255 / 255, 255 / 255, 255 / 255)
-    name_text_width, _ = write_text(
-        name_text,
-        data["name"]["first"],
-        face_name,
-        34,
-        max_width=name_rect_width - 1 * units.cm,
-        style={"small-caps": True},
-    )
-    name_text.textOut(" ")
-    write_text(
-        name_text,
-        data["name"]["last"],
-        face_name,
-        34,
-        max_width=name_rect_width - 1 * units.cm - name_text_width,
-        style={"small-caps": True},
-    )
-    doc.drawText(name_text)
 
-    headline_text = doc.beginText(
-        8.5 * units.cm,
-        pagesizes.A4[1] - 3.75 * units.cm,
-    )
-    headline_text.setFillColorRGB(210 / 255, 210 / 255, 210 / 255)
-    write_text(
-        headline_text,
-        resolve_string(data["headline"], lang),
-        face_name,
-        20,
-        max_width=name_rect_width - 1 * units.cm,
-    )
-    doc.drawText(headline_text)
+def render_cv(
+    output: Optional[str | BinaryIO],
+    data: dict,
+    data_path: str,
+    font: str | tuple[str, str],
+    lang: str = "en",
+    title: str = None,
+    include_watermark: bool = True,
+    image_dpi: int = 300,
+    layout: list[Box] = None,
+    subset_font: bool = False,
+    page_compression: bool = True,
+    repeat_sidebar: bool = False,
+    deterministic: bool = False,
+    template: str = None,
+) -> Optional[bytes]:
+    """Renders the CV to `output`, a path or a writable binary stream.
+
+    If `output` is `None` the PDF is rendered in memory and returned as bytes.
+    A path is written to a temporary file that is renamed once the PDF is
+    complete, so readers never see a partial file.
+    `layout` can be the pages previously returned by `measure_cv` for the same
+    data, in which case measuring is skipped. Otherwise each page is measured
+    and drawn before the next one, so only the current page's layout is held.
+
+    With `subset_font` only the glyphs used are embedded from the TrueType
+    font, see `register_font`. `page_compression` deflates the page streams.
+    With `deterministic`, reportlab's invariant mode fixes the creation date
+    and document ID, so the same inputs produce the same bytes.
+
+    `template` is the path of the layout template, see `load_template`. It is
+    compiled once per process and reused for every CV rendered with it.
+    """
+    if output is None or isinstance(output, str):
+        with open_output(output) as stream:
+            render_cv(
+                stream,
+                data,
+                data_path,
+                font,
+                lang,
+                title,
+                include_watermark,
+                image_dpi,
+                layout,
+                subset_font,
+                page_compression,
+                repeat_sidebar,
+                deterministic,
+                template,
+            )
+        return stream.getvalue() if output is None else None
 
-    doc.setFillColorRGB(0 / 255, 0 / 255, 0 / 255)
-    doc.setStrokeColorRGB(0 / 255, 0 / 255, 0 / 255)
-    doc.setLineWidth(1)
+    with span("load_template"):
+        plan = load_template(template)
 
-    y = y_pos - 0.5 * units.cm - 28
-    education_title = doc.beginText(
-        8.5 * units.cm,
-        y,
-    )
-    width, _ = write_text(
-        education_title,
-        resolve_string(strings["experience"], lang),
-        face_name,
-        28,
-        max_width=8 * units.cm,
-        style={"small-caps": True},
-    )
-    doc.drawText(education_title)
-    doc.line(
-        8.5 * units.cm, y - 0.25 * units.cm, 8.5 * units.cm + width, y - 0.25 * units.cm
+    doc = canvas.Canvas(
+        output,
+        pagesize=plan.page_size,
+        pageCompression=int(page_compression),
+        invariant=int(deterministic),
     )
+    doc.setTitle(title or get_title(data, lang))
 
-    y_pos = y - 0.25 * units.cm
+    with span("register_font"):
+        face_name = register_font(font, subset_font)
+    doc.setFont(face_name, 32)
 
-    for entry in data["experience"]:
-        y = y_pos - 0.25 * units.cm - 20
-        entry_title = doc.beginText(8.5 * units.cm, y)
-        write_text(
-            entry_title,
-            resolve_string(entry["company"], lang),
+    pages = iter(
+        layout
+        or iter_pages(
+            data,
+            data_path,
             face_name,
-            20,
-            max_width=pagesizes.A4[0] - 8 * units.cm - 1 * units.cm,
-            style={"small-caps": True},
+            lang,
+            include_watermark,
+            image_dpi,
+            repeat_sidebar,
+            plan,
         )
-        doc.drawText(entry_title)
-        y_pos = y
-
-        y = y_pos - 0.25 * units.cm - 11
-        entry_field = doc.beginText(8.5 * units.cm, y)
-        entry_field.setFont(face_name, 11)
-        date = (
-            resolve_string(entry["start"], lang)
-            if "end" not in entry
-            else f"{resolve_string(entry['start'], lang)} - {resolve_string(entry['end'], lang)}"
-        )
-        entry_field.textOut(f"{resolve_string(entry['position'], lang)} | {date}")
-        doc.drawText(entry_field)
-        y_pos = y
-
-        y_pos -= 0.2 * units.cm
-        for task in entry["tasks"]:
-            paragraph = Paragraph(
-                resolve_string(task, lang).replace("\n", "<br/>"),
-                bulletText="•",
-                style=styles.ParagraphStyle(
-                    "education-list",
-                    **get_style(
-                        list_style,
-                        fontName=face_name,
-                    ),
-                ),
-            )
-            paragraph.wrapOn(doc, pagesizes.A4[0] - 8.5 * units.cm - 1 * units.cm, 0)
-            paragraph.drawOn(
-                doc, 8.5 * units.cm, y_pos - 0.2 * units.cm - paragraph.height
-            )
-            y_pos -= 0.2 * units.cm + paragraph.height
-
-    if data["projects"]:
-        y = y_pos - 0.25 * units.cm - 20
-        entry_title = doc.beginText(8.5 * units.cm, y)
-        write_text(
-            entry_title,
-            resolve_string(strings["projects"], lang),
-            face_name,
-            20,
-            max_width=pagesizes.A4[0] - 8 * units.cm - 1 * units.cm,
-            style={"small-caps": True},
+    )
+    while True:
+        with span("measure"):
+            page = next(pages, None)
+        if page is None:
+            break
+        with span("render"):
+            render_layout(doc, page)
+            doc.showPage()
+
+    with span("save"):
+        doc.save()
+    return None
+
+
+def get_fork_context():
+    # Forked workers inherit the imported modules, fonts and caches, spawned
+    # ones would have to set all of that up again.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def get_filename(data: dict, title: str, lang: str, today: datetime) -> str:
+    if data.get("filename", None):
+        return data["filename"].format(
+            title=title,
+            firstname=data["name"]["first"],
+            lastname=data["name"]["first"],
+            date=today.strftime("%Y-%m-%d"),
+            lang=lang,
         )
-        doc.drawText(entry_title)
-        y_pos = y
-
-        y_pos -= 0.2 * units.cm
-        for project in data["projects"]:
-            paragraph = Paragraph(
-                resolve_string(project["description"], lang).replace("\n", "<br/>"),
-                bulletText="•",
-                style=styles.ParagraphStyle(
-                    "projects-list",
-                    **get_style(
-                        list_style,
-                        fontName=face_name,
-                    ),
-                ),
-            )
-            paragraph.wrapOn(doc, pagesizes.A4[0] - 8.5 * units.cm - 1 * units.cm, 0)
-            paragraph.drawOn(
-                doc, 8.5 * units.cm, y_pos - 0.2 * units.cm - paragraph.height
-            )
-            y_pos -= 0.2 * units.cm + paragraph.height
+    return f"{today.year}_{today.month:02d}_{today.day:02d}_{title}_{lang}.pdf"
 
-    y = y_pos - 0.5 * units.cm - 28
-    education_title = doc.beginText(
-        8.5 * units.cm,
-        y,
-    )
-    width, _ = write_text(
-        education_title,
-        resolve_string(strings["education"], lang),
-        face_name,
-        28,
-        max_width=8 * units.cm,
-        style={"small-caps": True},
-    )
-    doc.drawText(education_title)
-    doc.line(
-        8.5 * units.cm, y - 0.25 * units.cm, 8.5 * units.cm + width, y - 0.25 * units.cm
-    )
 
-    y_pos = y - 0.25 * units.cm
+def get_jobs(
+    data: dict,
+    langs: list[str],
+    title: str = None,
+    filename: str = None,
+    today: datetime = None,
+    prefix: str = "",
+) -> list[tuple[str, str, str]]:
+    """Returns the filename, title and language of every CV to render.
+
+    With several languages, an explicit `filename` is suffixed with the
+    language. Every filename starts with `prefix`.
+    """
+    today = today or datetime.today()
+    jobs = list()
+    for cv_lang in langs:
+        cv_title = title or get_title(data, cv_lang, today)
+        if not filename:
+            cv_filename = get_filename(data, cv_title, cv_lang, today)
+        elif len(langs) > 1:
+            root, ext = os.path.splitext(filename)
+            cv_filename = f"{root}_{cv_lang}{ext}"
+        else:
+            cv_filename = filename
+        jobs.append((prefix + cv_filename, cv_title, cv_lang))
+    return jobs
+
 
-    for entry in data["education"]:
-        y = y_pos - 0.25 * units.cm - 20
-        entry_title = doc.beginText(8.5 * units.cm, y)
-        write_text(
-            entry_title,
-            resolve_string(entry["institution"], lang),
-            face_name,
-            20,
-            max_width=pagesizes.A4[0] - 8 * units.cm - 1 * units.cm,
-            style={"small-caps": True},
-        )
-        doc.drawText(entry_title)
-        y_pos = y
-
-        y = y_pos - 0.25 * units.cm - 11
-        entry_field = doc.beginText(8.5 * units.cm, y)
-        entry_field.setFont(face_name, 11)
-        date = (
-            resolve_string(entry["start"], lang)
-            if "end" not in entry
-            else f"{resolve_string(entry['start'], lang)} - {resolve_string(entry['end'], lang)}"
-        )
-        entry_field.textOut(f"{resolve_string(entry['field'], lang)} | {date}")
-        doc.drawText(entry_field)
-        y_pos = y
-
-        y_pos -= 0.2 * units.cm
-        for task in entry["tasks"]:
-            paragraph = Paragraph(
-                resolve_string(task, lang).replace("\n", "<br/>"),
-                bulletText="•",
-                style=styles.ParagraphStyle(
-                    "education-list",
-                    **get_style(
-                        list_style,
-                        fontName=face_name,
-                    ),
-                ),
-            )
-            paragraph.wrapOn(doc, pagesizes.A4[0] - 8.5 * units.cm - 1 * units.cm, 0)
-            paragraph.drawOn(
-                doc, 8.5 * units.cm, y_pos - 0.2 * units.cm - paragraph.height
-            )
-            y_pos -= 0.2 * units.cm + paragraph.height
+def log_saved(output_path: str, filename: str):
+    size = os.path.getsize(os.path.join(output_path, filename))
+    logger.info("File saved at: ./%s (%d KB)", filename, round(size / 1024))
 
 
 def generate_cv(
     data_path: str,
-    font: tuple[str, str],
-    lang: str = "en",
+    font: str | tuple[str, str],
+    lang: str | list[str] = "en",
     title: str = None,
     filename: str = None,
     output_path: str = "./",
     include_watermark: bool = True,
-):
-    data = json.load(open(data_path, encoding="utf8"))
-    print("Loaded data for:", data["name"]["first"])
-
-    print("Generating CV...")
-
-    today = datetime.today()
-    if not title:
-        if data.get("title", None):
-            title = data["title"].format(
-                firstname=data["name"]["first"],
-                lastname=data["name"]["first"],
-                date=today.strftime("%Y-%m-%d"),
-                lang=lang,
+    image_dpi: int = 300,
+    max_workers: int = None,
+    profile: Profiler = None,
+    output: BinaryIO = None,
+    subset_font: bool = False,
+    page_compression: bool = True,
+    repeat_sidebar: bool = False,
+    deterministic: bool = False,
+    build_manifest: str = None,
+    template: str = None,
+    filename_prefix: str = "",
+) -> str | list[str]:
+    """Generates the CV in `lang` and returns the filename.
+
+    If `output` is a writable binary stream such as `io.BytesIO`, the PDF is
+    written to it instead of `output_path` and nothing is saved to disk. The
+    returned filename can then be used to name the document.
+
+    If `lang` is a list, a CV is generated for every language and the list of
+    filenames is returned. The data, font and portrait are then prepared once
+    and the documents are rendered in parallel by up to `max_workers`
+    processes.
+
+    With `profile`, the time spent in each phase is recorded in the profiler.
+    Languages are then rendered one after another in this process so that
+    every phase is captured.
+
+    `subset_font`, `page_compression`, `repeat_sidebar`, `deterministic` and
+    `template` are passed on to `render_cv`. With `deterministic` the date in
+    filenames and titles is taken from `SOURCE_DATE_EPOCH` if it is set.
+
+    `build_manifest` is a directory in which the inputs of every rendered CV
+    are recorded. CVs whose inputs haven't changed since and whose file still
+    exists are skipped, their previous filename is returned.
+
+    `filename_prefix` is put in front of every filename, `generate_cvs` uses
+    it to keep CVs apart that would be saved under the same name. Unlike
+    `filename` it isn't an input of the build manifest, so a CV whose prefix
+    changes is still up to date while its previous file exists.
+    """
+    if profile is not None:
+        with profile.activate():
+            return generate_cv(
+                data_path,
+                font,
+                lang,
+                title,
+                filename,
+                output_path,
+                include_watermark,
+                image_dpi,
+                max_workers,
+                output=output,
+                subset_font=subset_font,
+                page_compression=page_compression,
+                repeat_sidebar=repeat_sidebar,
+                deterministic=deterministic,
+                build_manifest=build_manifest,
+                template=template,
+                filename_prefix=filename_prefix,
             )
-        else:
-            title = f"CV_{data['name']['first']}_{data['name']['last']}"
-    if not filename:
-        if data.get("filename", None):
-            filename = data["filename"].format(
-                title=title,
-                firstname=data["name"]["first"],
-                lastname=data["name"]["first"],
-                date=today.strftime("%Y-%m-%d"),
-                lang=lang,
-            )
-        else:
-            filename = (
-                f"{today.year}_{today.month:02d}_{today.day:02d}_{title}_{lang}.pdf"
-            )
-    doc = canvas.Canvas(
-        filename=os.path.abspath(os.path.join(output_path, filename)),
-        pagesize=pagesizes.A4,
-    )
-    doc.setTitle(title)
 
-    afm_file, pfb_file = font
-    just_face = pdfmetrics.EmbeddedType1Face(
-        os.path.join("__cache__", "fonts", afm_file),
-        os.path.join("__cache__", "fonts", pfb_file),
-    )
-    face_name, _ = afm_file.split(".")
-    pdfmetrics.registerTypeFace(just_face)
-    just_font = pdfmetrics.Font(face_name, face_name, "WinAnsiEncoding")
-    pdfmetrics.registerFont(just_font)
-    doc.setFont(face_name, 32)
+    with span("load_data"):
+        data = load_data(data_path)
+    logger.info("Loaded data for: %s", data["name"]["first"])
 
-    draw_left(doc, data, data_path, face_name, lang, include_watermark)
-    draw_right(doc, data, data_path, face_name, lang)
+    logger.info("Generating CV...")
 
-    doc.save()
+    langs = [lang] if isinstance(lang, str) else list(lang)
+    if output is not None and len(langs) > 1:
+        raise ValueError("An output stream can only hold a single language")
 
-    print(f"File saved at: ./{filename}")
+    jobs = get_jobs(
+        data,
+        langs,
+        title,
+        filename,
+        get_build_date() if deterministic else None,
+        filename_prefix,
+    )
+    filenames = [cv_filename for cv_filename, _, _ in jobs]
+
+    manifest = None
+    if build_manifest is not None and output is None:
+        manifest = BuildManifest(build_manifest)
+        options = {
+            "title": title,
+            "filename": filename,
+            "include_watermark": include_watermark,
+            "image_dpi": image_dpi,
+            "subset_font": subset_font,
+            "page_compression": page_compression,
+            "repeat_sidebar": repeat_sidebar,
+            "deterministic": deterministic,
+            "template": load_template(template).digest,
+        }
+        digests = dict()
+        pending = list()
+        for i, (cv_filename, cv_title, cv_lang) in enumerate(jobs):
+            digest = input_hash(data, data_path, font, cv_lang, **options)
+            previous = manifest.get(BuildManifest.key(data_path, cv_lang), digest)
+            if previous and os.path.exists(os.path.join(output_path, previous)):
+                filenames[i] = previous
+                logger.info("Up to date: ./%s", previous)
+            else:
+                digests[cv_lang] = digest
+                pending.append((cv_filename, cv_title, cv_lang))
+        jobs = pending
+
+    if len(jobs) == 1 or (jobs and is_profiling()):
+        for cv_filename, cv_title, cv_lang in jobs:
+            with span(f"render_cv:{cv_lang}"):
+                render_cv(
+                    output or os.path.abspath(os.path.join(output_path, cv_filename)),
+                    data,
+                    data_path,
+                    font,
+                    cv_lang,
+                    cv_title,
+                    include_watermark,
+                    image_dpi,
+                    subset_font=subset_font,
+                    page_compression=page_compression,
+                    repeat_sidebar=repeat_sidebar,
+                    deterministic=deterministic,
+                    template=template,
+                )
+            if output is None:
+                log_saved(output_path, cv_filename)
+    elif jobs:
+        with span("register_font"):
+            face_name = register_font(font, subset_font)
+
+        # Measured up front so the portrait is prepared once and the forked
+        # workers start with the registered font, the compiled template and
+        # the section cache filled.
+        plan = load_template(template)
+        for _, _, cv_lang in jobs:
+            measure_cv(
+                data,
+                data_path,
+                face_name,
+                cv_lang,
+                include_watermark,
+                image_dpi,
+                repeat_sidebar,
+                plan,
+            )
+
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers or os.cpu_count(), len(jobs)),
+            mp_context=get_fork_context(),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    render_cv,
+                    os.path.abspath(os.path.join(output_path, cv_filename)),
+                    data,
+                    data_path,
+                    font,
+                    cv_lang,
+                    cv_title,
+                    include_watermark,
+                    image_dpi,
+                    subset_font=subset_font,
+                    page_compression=page_compression,
+                    repeat_sidebar=repeat_sidebar,
+                    deterministic=deterministic,
+                    template=template,
+                )
+                for cv_filename, cv_title, cv_lang in jobs
+            ]
+            for future, (cv_filename, _, _) in zip(futures, jobs):
+                future.result()
+                log_saved(output_path, cv_filename)
+
+    if manifest is not None:
+        for cv_filename, _, cv_lang in jobs:
+            manifest.record(
+                BuildManifest.key(data_path, cv_lang), digests[cv_lang], cv_filename
+            )
 
-    return filename
+    return filenames[0] if isinstance(lang, str) else filenames
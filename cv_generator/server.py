@@ -0,0 +1,174 @@
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .main import render_cv
+from .util.fonts import register_font
+
+
+def _init_worker(font: str | tuple[str, str]):
+    register_font(font)
+
+
+def _render(
+    data: dict,
+    data_dir: str,
+    font: str | tuple[str, str],
+    lang: str,
+    include_watermark: bool,
+) -> bytes:
+    return render_cv(
+        None, data, data_dir, font, lang, include_watermark=include_watermark
+    )
+
+
+class RenderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        font: str | tuple[str, str],
+        data_dir: str = "./",
+        max_workers: int = None,
+        max_pending: int = None,
+        timeout: float = 30,
+    ):
+        super().__init__(address, RenderRequestHandler)
+        self.font = font
+        self.data_dir = os.path.abspath(data_dir)
+        self.render_timeout = timeout
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker, initargs=(font,)
+        )
+        # Jobs that are running or queued in the executor, new requests are
+        # rejected once this is exhausted instead of piling up in the queue.
+        self.capacity = self.max_workers + (
+            max_pending if max_pending is not None else self.max_workers
+        )
+        self.pending = 0
+        self.lock = threading.Lock()
+
+    def submit(self, data: dict, lang: str, include_watermark: bool):
+        with self.lock:
+            if self.pending >= self.capacity:
+                return None
+            self.pending += 1
+        try:
+            future = self.executor.submit(
+                _render, data, self.data_dir, self.font, lang, include_watermark
+            )
+        except BaseException:
+            self.release()
+            raise
+        future.add_done_callback(self.release)
+        return future
+
+    def release(self, *_):
+        with self.lock:
+            self.pending -= 1
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    server: RenderServer
+
+    def send_json(self, status: HTTPStatus, body: dict, headers: dict = {}):
+        payload = json.dumps(body).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/health":
+            return self.send_json(HTTPStatus.NOT_FOUND, {"error": "Not found."})
+        self.send_json(
+            HTTPStatus.OK,
+            {"capacity": self.server.capacity, "pending": self.server.pending},
+        )
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/render":
+            return self.send_json(HTTPStatus.NOT_FOUND, {"error": "Not found."})
+
+        query = parse_qs(url.query)
+        lang = query.get("lang", ["en"])[0]
+        include_watermark = query.get("watermark", ["1"])[0] not in ("0", "false")
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            data = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            return self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        if not isinstance(data, dict):
+            return self.send_json(
+                HTTPStatus.BAD_REQUEST, {"error": "Body must be a JSON object."}
+            )
+
+        if data.get("img"):
+            img = os.path.abspath(os.path.join(self.server.data_dir, data["img"]))
+            if os.path.commonpath([img, self.server.data_dir]) != self.server.data_dir:
+                return self.send_json(
+                    HTTPStatus.BAD_REQUEST, {"error": "Image outside of data dir."}
+                )
+            data["img"] = img
+
+        future = self.server.submit(data, lang, include_watermark)
+        if future is None:
+            return self.send_json(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "Server is busy."},
+                {"Retry-After": "1"},
+            )
+
+        try:
+            pdf = future.result(timeout=self.server.render_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            return self.send_json(
+                HTTPStatus.GATEWAY_TIMEOUT, {"error": "Rendering timed out."}
+            )
+        except Exception as e:
+            return self.send_json(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                {"error": f"{type(e).__name__}: {e}"},
+            )
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(pdf)))
+        self.end_headers()
+        self.wfile.write(pdf)
+
+
+def serve(
+    host: str,
+    port: int,
+    font: str | tuple[str, str],
+    data_dir: str = "./",
+    max_workers: int = None,
+    max_pending: int = None,
+    timeout: float = 30,
+):
+    with RenderServer(
+        (host, port), font, data_dir, max_workers, max_pending, timeout
+    ) as server:
+        print(f"Serving on http://{host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,85 @@
+import io
+import tarfile
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from typing import BinaryIO
+
+
+class Archive(ABC):
+    """Writes files into an archive stream one after another.
+
+    Nothing is seeked, so `fileobj` can be a pipe such as stdout.
+    """
+
+    extensions: tuple[str, ...] = ()
+
+    @abstractmethod
+    def add(self, name: str, data: bytes):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class ZipArchive(Archive):
+    extensions = (".zip",)
+
+    def __init__(self, fileobj: BinaryIO):
+        # PDFs are compressed already, deflating them again gains little.
+        self.zip = zipfile.ZipFile(fileobj, "w", zipfile.ZIP_STORED)
+
+    def add(self, name: str, data: bytes):
+        self.zip.writestr(zipfile.ZipInfo(name, time.localtime()[:6]), data)
+
+    def close(self):
+        self.zip.close()
+
+
+class TarArchive(Archive):
+    extensions = (".tar",)
+    mode = "w|"
+
+    def __init__(self, fileobj: BinaryIO):
+        self.tar = tarfile.open(fileobj=fileobj, mode=self.mode)
+
+    def add(self, name: str, data: bytes):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self.tar.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self.tar.close()
+
+
+class TarGzArchive(TarArchive):
+    extensions = (".tar.gz", ".tgz")
+    mode = "w|gz"
+
+
+archive_formats: dict[str, type[Archive]] = {
+    "zip": ZipArchive,
+    "tar": TarArchive,
+    "tar.gz": TarGzArchive,
+}
+
+
+def get_archive_format(path: str) -> str:
+    for name, archive_type in archive_formats.items():
+        if path.endswith(archive_type.extensions):
+            return name
+    raise ValueError(f"Unknown archive format: {path}")
+
+
+def open_archive(fileobj: BinaryIO, archive_format: str) -> Archive:
+    if archive_format not in archive_formats:
+        raise ValueError(f"Unknown archive format: {archive_format}")
+    return archive_formats[archive_format](fileobj)
@@ -0,0 +1,101 @@
+import glob
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+from .file_cache import atomic_path, hash_file
+from .fonts import get_font_paths
+from .i18n import strings
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@lru_cache(maxsize=None)
+def source_hash() -> str:
+    """Hashes the package's source and icons, which stand in for a version."""
+    digest = hashlib.sha256()
+    paths = glob.glob(os.path.join(PACKAGE_DIR, "**", "*.py"), recursive=True)
+    paths += glob.glob(os.path.join("assets", "icons", "*"))
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, PACKAGE_DIR).encode("utf8"))
+        digest.update(hash_file(path).encode("utf8"))
+    return digest.hexdigest()
+
+
+def font_hash(font: str | tuple[str, str]) -> str:
+    return ":".join(hash_file(path) for path in get_font_paths(font))
+
+
+def input_hash(
+    data: dict, data_path: str, font: str | tuple[str, str], lang: str, **options
+) -> str:
+    """Hashes everything a CV is rendered from.
+
+    That is the data, the portrait, the font, the strings, the language,
+    the rendering `options` and the package's source.
+    """
+    inputs = {
+        "data": data,
+        "portrait": (
+            hash_file(os.path.join(os.path.dirname(data_path), data["img"]))
+            if data.get("img")
+            else None
+        ),
+        "font": font_hash(font),
+        "strings": strings,
+        "lang": lang,
+        "options": options,
+        "source": source_hash(),
+    }
+    return hashlib.sha256(
+        json.dumps(inputs, sort_keys=True, default=repr).encode("utf8")
+    ).hexdigest()
+
+
+def get_build_date() -> datetime:
+    """Returns `SOURCE_DATE_EPOCH` if it is set, the current date otherwise."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), timezone.utc)
+    return datetime.today()
+
+
+class BuildManifest:
+    """Remembers the input hash every CV was last rendered from.
+
+    Entries are keyed on the data file and language, so a CV whose inputs
+    are unchanged can be skipped even if its filename would differ today.
+    Every entry is its own file in `directory`, so processes rendering
+    different CVs never write to the same file.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(data_path: str, lang: str) -> str:
+        return f"{os.path.abspath(data_path)}:{lang}"
+
+    def path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode("utf8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get(self, key: str, digest: str) -> Optional[str]:
+        """Returns the filename rendered for `key` if its hash is `digest`."""
+        try:
+            with open(self.path(key), encoding="utf8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if entry.get("key") == key and entry.get("hash") == digest:
+            return entry["filename"]
+        return None
+
+    def record(self, key: str, digest: str, filename: str):
+        with atomic_path(self.path(key)) as tmp:
+            with open(tmp, "w", encoding="utf8") as f:
+                json.dump({"key": key, "hash": digest, "filename": filename}, f)
@@ -0,0 +1,125 @@
+from fontTools import afmLib, t1Lib
+from fontTools.agl import toUnicode
+from fontTools.misc.psCharStrings import T1CharString
+from fontTools.pens.basePen import BasePen
+from fontTools.pens.boundsPen import BoundsPen
+from fontTools.pens.transformPen import TransformPen
+from fontTools.ttLib import TTFont
+from reportlab.pdfbase import pdfmetrics
+
+
+class T1CharStringPen(BasePen):
+    def __init__(self, width: int, glyph_set):
+        super().__init__(glyph_set)
+        self.program = [0, width, "hsbw"]
+        self.current = (0, 0)
+
+    def _delta(self, pt) -> list[int]:
+        x, y = round(pt[0]), round(pt[1])
+        dx, dy = x - self.current[0], y - self.current[1]
+        self.current = (x, y)
+        return [dx, dy]
+
+    def _moveTo(self, pt):
+        self.program += self._delta(pt) + ["rmoveto"]
+
+    def _lineTo(self, pt):
+        self.program += self._delta(pt) + ["rlineto"]
+
+    def _curveToOne(self, pt1, pt2, pt3):
+        self.program += (
+            self._delta(pt1) + self._delta(pt2) + self._delta(pt3) + ["rrcurveto"]
+        )
+
+    def _closePath(self):
+        self.program.append("closepath")
+
+    _endPath = _closePath
+
+    def get_char_string(self) -> T1CharString:
+        return T1CharString(program=self.program + ["endchar"])
+
+
+def convert_font(
+    ttf_path: str, afm_path: str, pfb_path: str, encoding: str = "WinAnsiEncoding"
+) -> str:
+    """Converts a TrueType font to Type 1 AFM/PFB files covering `encoding`."""
+    font = TTFont(ttf_path)
+    glyph_set = font.getGlyphSet()
+    cmap = font.getBestCmap()
+    scale = 1000 / font["head"].unitsPerEm
+    face_name = font["name"].getDebugName(6)
+
+    def draw(glyph_name: str) -> tuple[T1CharString, int, tuple]:
+        glyph = glyph_set[glyph_name]
+        width = round(glyph.width * scale)
+        pen = T1CharStringPen(width, glyph_set)
+        glyph.draw(TransformPen(pen, (scale, 0, 0, scale, 0, 0)))
+        bounds_pen = BoundsPen(glyph_set)
+        glyph.draw(TransformPen(bounds_pen, (scale, 0, 0, scale, 0, 0)))
+        bounds = tuple(round(v) for v in (bounds_pen.bounds or (0, 0, 0, 0)))
+        return pen.get_char_string(), width, bounds
+
+    afm = afmLib.AFM()
+    char_strings = {".notdef": draw(".notdef")[0]}
+    font_encoding = [".notdef"] * 256
+    for code, name in enumerate(pdfmetrics.getEncoding(encoding).vector):
+        if not name or name in char_strings:
+            continue
+        glyph_name = cmap.get(ord(toUnicode(name)[0]))
+        if glyph_name is None:
+            continue
+        char_strings[name], width, bounds = draw(glyph_name)
+        font_encoding[code] = name
+        afm._chars[name] = (code, width, bounds)
+
+    head, os2, post = font["head"], font["OS/2"], font["post"]
+    bbox = tuple(round(v * scale) for v in (head.xMin, head.yMin, head.xMax, head.yMax))
+    afm._attrs.update(
+        FontName=face_name,
+        FullName=font["name"].getDebugName(4),
+        FamilyName=font["name"].getDebugName(1),
+        Weight=font["name"].getDebugName(2),
+        ItalicAngle=post.italicAngle,
+        IsFixedPitch="true" if post.isFixedPitch else "false",
+        FontBBox=bbox,
+        EncodingScheme="FontSpecific",
+        CapHeight=round(os2.sCapHeight * scale),
+        XHeight=round(os2.sxHeight * scale),
+        Ascender=round(os2.sTypoAscender * scale),
+        Descender=round(os2.sTypoDescender * scale),
+    )
+    afm.write(afm_path, sep="\n")
+
+    t1 = t1Lib.T1Font.__new__(t1Lib.T1Font)
+    t1.encoding = "ascii"
+    t1.font = {
+        "FontType": 1,
+        "FontName": face_name,
+        "FontInfo": {
+            "FullName": font["name"].getDebugName(4),
+            "ItalicAngle": post.italicAngle,
+            "isFixedPitch": bool(post.isFixedPitch),
+            "UnderlinePosition": round(post.underlinePosition * scale),
+            "UnderlineThickness": round(post.underlineThickness * scale),
+        },
+        "PaintType": 0,
+        "FontMatrix": [0.001, 0, 0, 0.001, 0, 0],
+        "Encoding": font_encoding,
+        "FontBBox": bbox,
+        "Private": {
+            "RD": t1Lib.RD_value,
+            "ND": t1Lib.ND_values[0],
+            "NP": t1Lib.PD_values[0],
+            "BlueValues": [],
+            "lenIV": 4,
+            "MinFeature": (16, 16),
+            "password": 5839,
+            "Subrs": [T1CharString(bytecode=subr) for subr in t1Lib.std_subrs],
+            "OtherSubrs": [],
+        },
+        "CharStrings": char_strings,
+    }
+    t1Lib.write(pfb_path, t1.createData(), "PFB")
+
+    return face_name
@@ -0,0 +1,23 @@
+import json
+import os
+
+_data: dict[str, tuple[tuple[int, int], dict]] = dict()
+
+
+def load_data(path: str) -> dict:
+    """Loads a CV data file, re-reading it only once it changes on disk.
+
+    The returned dict is shared between calls and must not be modified.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _data.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    with open(path, encoding="utf8") as f:
+        data = json.load(f)
+    _data[path] = (key, data)
+    return data
@@ -0,0 +1,182 @@
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+CACHE_ROOT_ENV = "CV_GENERATOR_CACHE"
+
+# Directory the caches live in, relative to the working directory unless
+# configured with `set_cache_root` or the environment variable.
+cache_root = os.environ.get(CACHE_ROOT_ENV, "__cache__")
+
+_digests: dict[tuple[str, float, int], str] = dict()
+_caches: list["FileCache"] = list()
+
+
+def get_cache_dir(name: str) -> str:
+    """Returns the directory `name` below the cache root, creating it."""
+    path = os.path.join(cache_root, name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def set_cache_root(path: str):
+    """Moves the caches below `path`, before anything is rendered.
+
+    The path is also set in the environment, so worker processes started
+    afterwards use it too, whether they are forked or spawned.
+    """
+    global cache_root
+    cache_root = path
+    os.environ[CACHE_ROOT_ENV] = path
+    for cache in _caches:
+        cache.directory = os.path.join(path, cache.name)
+
+
+def tmp_path(path: str) -> str:
+    """Returns a temporary path next to `path` that no other thread uses."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+@contextmanager
+def atomic_path(path: str) -> Iterator[str]:
+    """Yields a temporary path to write to, which then replaces `path`.
+
+    Readers see either the previous file or the complete new one, never a
+    partial write. If the block raises, the temporary file is removed.
+    """
+    tmp = tmp_path(path)
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def hash_file(path: str) -> str:
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+    if key in _digests:
+        return _digests[key]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    _digests[key] = digest.hexdigest()
+    return _digests[key]
+
+
+class FileCache:
+    """A directory of content-addressed files with a size budget.
+
+    Entries are evicted least recently used first once the directory grows
+    beyond `max_size` bytes, using the modification time which is refreshed
+    on every hit. Entries used within the last `grace_period` seconds are
+    kept, as concurrent renders may still be about to read them.
+
+    Caches created with `named` live below the cache root and move with it.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: Optional[int] = None,
+        grace_period: float = 60,
+    ):
+        self.directory = directory
+        self.max_size = max_size
+        self.grace_period = grace_period
+        self.name = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def named(cls, name: str, max_size: Optional[int] = None) -> "FileCache":
+        cache = cls(os.path.join(cache_root, name), max_size)
+        cache.name = name
+        _caches.append(cache)
+        return cache
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key: str, write: Callable[[str], None]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        # Entries are content-addressed, so concurrent writers of the same
+        # key produce the same file and the last replace wins harmlessly.
+        with atomic_path(path) as tmp:
+            write(tmp)
+        self.evict(keep=path)
+        return path
+
+    def entries(self) -> list[os.DirEntry]:
+        if not os.path.isdir(self.directory):
+            return list()
+        return [
+            entry
+            for entry in os.scandir(self.directory)
+            if entry.is_file() and not entry.name.endswith(".tmp")
+        ]
+
+    def _stats(self) -> list[tuple[float, int, str]]:
+        # Other processes may remove entries while they are listed.
+        stats = list()
+        for entry in self.entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            stats.append((stat.st_mtime, stat.st_size, entry.path))
+        return stats
+
+    def evict(self, keep: str = None):
+        if self.max_size is None:
+            return
+        entries = sorted(self._stats())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        recent = time.time() - self.grace_period
+        for mtime, entry_size, path in entries:
+            if size <= self.max_size or mtime >= recent:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            size -= entry_size
+            self.evictions += 1
+
+    def clear(self):
+        for entry in self.entries():
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        entries = self._stats()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "size": sum(entry_size for _, entry_size, _ in entries),
+            "max_size": self.max_size,
+        }
@@ -0,0 +1,92 @@
+import os
+import threading
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from .convert_font import convert_font
+from .file_cache import atomic_path, get_cache_dir, hash_file
+
+FONTS_DIR = os.path.join("assets", "Source_Sans_Pro")
+DEFAULT_FONT = "SourceSansPro-Regular"
+
+_registered_fonts: dict[tuple[str | tuple[str, str], bool], str] = dict()
+# Held while registering, reportlab's registry isn't safe to change from
+# several threads at once.
+_lock = threading.Lock()
+
+
+def get_type1_font(ttf_path: str) -> tuple[str, str]:
+    """Returns AFM/PFB files for a TrueType font, converting it on first use."""
+    cache_dir = get_cache_dir("fonts")
+
+    name = os.path.splitext(os.path.basename(ttf_path))[0]
+    digest = hash_file(ttf_path)[:16]
+    afm_path = os.path.join(cache_dir, f"{name}-{digest}.afm")
+    pfb_path = os.path.join(cache_dir, f"{name}-{digest}.pfb")
+
+    if not os.path.exists(afm_path) or not os.path.exists(pfb_path):
+        # Written next to their final paths first, so concurrent renders
+        # never read a partially converted font.
+        with atomic_path(afm_path) as afm_tmp, atomic_path(pfb_path) as pfb_tmp:
+            convert_font(ttf_path, afm_tmp, pfb_tmp)
+
+    return afm_path, pfb_path
+
+
+def get_ttf_path(font: str) -> str:
+    return font if font.endswith(".ttf") else os.path.join(FONTS_DIR, f"{font}.ttf")
+
+
+def get_font_paths(font: str | tuple[str, str]) -> list[str]:
+    """Returns the files `font` is loaded from, see `register_font`."""
+    if isinstance(font, tuple):
+        return [os.path.join(get_cache_dir("fonts"), name) for name in font]
+    return [get_ttf_path(font)]
+
+
+def register_font(
+    font: str | tuple[str, str] = DEFAULT_FONT, subset: bool = False
+) -> str:
+    """Registers a font once per process and returns its face name.
+
+    `font` is either the name of a bundled TrueType font, a path to a TTF file
+    or a tuple of pre-made AFM/PFB files in the `fonts` cache directory.
+
+    By default TrueType fonts are converted to Type 1 and embedded whole. With
+    `subset` the TrueType font is registered directly instead, so only the
+    glyphs used in a document are embedded.
+
+    Fonts are registered once even if several threads ask for them at once.
+    """
+    if (font, subset) in _registered_fonts:
+        return _registered_fonts[(font, subset)]
+
+    with _lock:
+        if (font, subset) not in _registered_fonts:
+            _registered_fonts[(font, subset)] = _register_font(font, subset)
+    return _registered_fonts[(font, subset)]
+
+
+def _register_font(font: str | tuple[str, str], subset: bool) -> str:
+    if subset:
+        if isinstance(font, tuple):
+            raise ValueError("Only TrueType fonts can be embedded as subsets")
+        ttf_path = get_ttf_path(font)
+        face_name = f"{os.path.splitext(os.path.basename(ttf_path))[0]}-Subset"
+        if face_name not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont(face_name, ttf_path))
+        return face_name
+
+    if isinstance(font, tuple):
+        afm_path, pfb_path = get_font_paths(font)
+    else:
+        afm_path, pfb_path = get_type1_font(get_ttf_path(font))
+
+    just_face = pdfmetrics.EmbeddedType1Face(afm_path, pfb_path)
+    face_name = just_face.name
+    if face_name not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerTypeFace(just_face)
+        just_font = pdfmetrics.Font(face_name, face_name, "WinAnsiEncoding")
+        pdfmetrics.registerFont(just_font)
+    return face_name
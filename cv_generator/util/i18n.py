@@ -1,3 +1,10 @@
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
 strings = {
     "education": {
         "en": "Education",
@@ -46,14 +53,118 @@ strings = {
 }
 
 
+# Keys of a dict holding the translations of a single value, e.g. "de" or
+# "de-CH".
+LANGUAGE_CODE = re.compile(r"^[a-z]{2,3}(?:[-_][A-Za-z0-9]{2,8})*$")
+
+
+@lru_cache(maxsize=None)
+def fallback_chain(lang: str, default_lang: str = "en") -> tuple[str, ...]:
+    """Returns the languages to try for `lang`, e.g. de-CH, de and then en."""
+    chain = list()
+    parts = re.split(r"[-_]", lang)
+    for i in range(len(parts), 0, -1):
+        chain.append("-".join(parts[:i]))
+    if default_lang not in chain:
+        chain.append(default_lang)
+    return tuple(chain)
+
+
 def resolve_string(value: dict | str, lang: str, default_lang: str = "en") -> str:
     if isinstance(value, dict):
-        return value.get(
-            lang,
-            value.get(
-                default_lang,
-                value[list(value.keys())[0]] if value else "",
-            ),
-        )
+        for fallback in fallback_chain(lang, default_lang):
+            if fallback in value:
+                return value[fallback]
+        return next(iter(value.values()), "")
     else:
         return value
+
+
+def is_translated(value) -> bool:
+    return (
+        isinstance(value, dict)
+        and bool(value)
+        and all(
+            isinstance(k, str) and LANGUAGE_CODE.match(k) and isinstance(v, str)
+            for k, v in value.items()
+        )
+    )
+
+
+def _localize(value, chain: tuple[str, ...]):
+    if isinstance(value, dict):
+        if is_translated(value):
+            for fallback in chain:
+                if fallback in value:
+                    return value[fallback]
+            return next(iter(value.values()))
+        return {k: _localize(v, chain) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_localize(v, chain) for v in value]
+    return value
+
+
+_views: OrderedDict[tuple[str, str, str], dict] = OrderedDict()
+_views_lock = threading.Lock()
+MAX_VIEWS = 64
+
+
+def localize(data: dict, lang: str, default_lang: str = "en") -> dict:
+    """Returns a view of `data` with every translated value resolved for `lang`.
+
+    Values are resolved in one pass along `fallback_chain`. Views are cached by
+    a hash of the data, so rendering the same data again, in this or another
+    process, reuses them. The returned dict is shared and must not be modified.
+    """
+    key = (
+        hashlib.sha256(
+            json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf8")
+        ).hexdigest(),
+        lang,
+        default_lang,
+    )
+    with _views_lock:
+        view = _views.get(key)
+        if view is not None:
+            _views.move_to_end(key)
+            return view
+    view = _localize(data, fallback_chain(lang, default_lang))
+    with _views_lock:
+        _views[key] = view
+        while len(_views) > MAX_VIEWS:
+            _views.popitem(last=False)
+    return view
+
+
+def _merge(target: dict, source: dict):
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def load_catalog(path: str):
+    """Adds the strings in the JSON file at `path` to `strings`.
+
+    The file has the same structure as `strings`, existing translations are
+    extended or overridden.
+    """
+    with open(path, encoding="utf8") as f:
+        _merge(strings, json.load(f))
+    catalog.cache_clear()
+    catalog_digest.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def catalog_digest() -> str:
+    """Hashes `strings`, so caches of measured text change with the catalog."""
+    return hashlib.sha256(
+        json.dumps(strings, sort_keys=True).encode("utf8")
+    ).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def catalog(lang: str, default_lang: str = "en") -> dict:
+    """Returns `strings` compiled for `lang`, keys map to resolved strings."""
+    return _localize(strings, fallback_chain(lang, default_lang))
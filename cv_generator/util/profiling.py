@@ -0,0 +1,82 @@
+import cProfile
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Optional
+
+_profiler: ContextVar[Optional["Profiler"]] = ContextVar("profiler", default=None)
+_disabled = nullcontext()
+
+
+def span(name: str):
+    """Times the enclosed block as `name` if a profiler is active.
+
+    Without an active profiler this returns a shared no-op context manager, so
+    spans can stay in place on the hot path.
+    """
+    profiler = _profiler.get()
+    if profiler is None:
+        return _disabled
+    return profiler.span(name)
+
+
+def is_profiling() -> bool:
+    return _profiler.get() is not None
+
+
+class Profiler:
+    """Collects nested timing spans while it is active.
+
+    With `cprofile` a `cProfile` profile is recorded alongside, with `memory`
+    the peak memory traced by `tracemalloc` is reported. Both slow rendering
+    down noticeably, which the spans then include.
+    """
+
+    def __init__(self, cprofile: bool = False, memory: bool = False):
+        self.root = {"name": "total", "duration": 0, "children": []}
+        self.stack = [self.root]
+        self.stats = cProfile.Profile() if cprofile else None
+        self.memory = memory
+        self.peak_memory = None
+
+    @contextmanager
+    def span(self, name: str):
+        node = {"name": name, "duration": 0, "children": []}
+        self.stack[-1]["children"].append(node)
+        self.stack.append(node)
+        start = time.perf_counter()
+        try:
+            yield node
+        finally:
+            node["duration"] += time.perf_counter() - start
+            self.stack.pop()
+
+    @contextmanager
+    def activate(self):
+        token = _profiler.set(self)
+        if self.memory:
+            tracemalloc.start()
+        if self.stats:
+            self.stats.enable()
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.root["duration"] += time.perf_counter() - start
+            if self.stats:
+                self.stats.disable()
+            if self.memory:
+                _, self.peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            _profiler.reset(token)
+
+    def to_dict(self) -> dict:
+        result = {"spans": self.root}
+        if self.peak_memory is not None:
+            result["peak_memory"] = self.peak_memory
+        return result
+
+    def dump_stats(self, path: str):
+        """Writes the `cProfile` stats to `path` for use with `pstats`."""
+        self.stats.dump_stats(path)
@@ -1,4 +1,7 @@
+import threading
+
 from reportlab.lib import colors
+from reportlab.lib.styles import ParagraphStyle
 
 
 list_style = {
@@ -12,3 +15,32 @@ list_style = {
 
 def get_style(style, **kwargs):
     return {**style, **kwargs}
+
+
+class StyleRegistry:
+    """Builds every named `ParagraphStyle` once.
+
+    Styles are keyed on their name and options, which include the font, so
+    each style is built once per font and the same object is returned after.
+    """
+
+    def __init__(self):
+        self.styles: dict[tuple, ParagraphStyle] = dict()
+        self.lock = threading.Lock()
+
+    def get(self, name: str, style: dict) -> ParagraphStyle:
+        key = (name, frozenset(style.items()))
+        paragraph_style = self.styles.get(key)
+        if paragraph_style is None:
+            with self.lock:
+                paragraph_style = self.styles.setdefault(
+                    key, ParagraphStyle(name, **style)
+                )
+        return paragraph_style
+
+    def clear(self):
+        with self.lock:
+            self.styles.clear()
+
+
+style_registry = StyleRegistry()
@@ -1,14 +1,308 @@
+import ctypes
+import ctypes.util
+import multiprocessing
 import os
+import runpy
+import select
+import struct
 import subprocess
 import sys
 import time
-from typing import Optional
+import traceback
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, Optional
 
 import pathspec
 
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def load_spec(dir_path: str, ignore_file: str) -> Optional[pathspec.PathSpec]:
+    if not os.path.exists(os.path.join(dir_path, ignore_file)):
+        return None
+    with open(os.path.join(dir_path, ignore_file)) as f:
+        return pathspec.PathSpec.from_lines(pathspec.patterns.GitWildMatchPattern, f)
+
+
+class Watcher(ABC):
+    """Tracks the files in `dir_path` that aren't ignored by `spec`.
+
+    Every file's mtime and size are kept so that any change to them is
+    noticed, not only timestamps moving forward.
+    """
+
+    name = None
+
+    def __init__(
+        self,
+        dir_path: str,
+        spec: Optional[pathspec.PathSpec] = None,
+        debounce: float = 0.05,
+    ):
+        self.dir_path = dir_path
+        self.spec = spec
+        self.debounce = debounce
+        self.state: dict[str, tuple[int, int]] = {
+            path: self.stat(path) for path in self.scan(dir_path)
+        }
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        if path == os.path.abspath(__file__):
+            return True
+        if not self.spec:
+            return False
+        rel_path = os.path.relpath(path, self.dir_path)
+        return self.spec.match_file(rel_path + "/" if is_dir else rel_path)
+
+    def scan(self, dir_path: str) -> Iterator[str]:
+        for root, dirs, files in os.walk(dir_path):
+            # Pruned in place so ignored directories aren't walked at all.
+            dirs[:] = [
+                d for d in dirs if not self.is_ignored(os.path.join(root, d), True)
+            ]
+            for f in files:
+                if not self.is_ignored(os.path.join(root, f)):
+                    yield os.path.join(root, f)
+
+    @staticmethod
+    def stat(path: str) -> Optional[tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def update(self, paths: Iterable[str]) -> set[str]:
+        """Updates the state of `paths` and returns the ones that changed."""
+        changed = set()
+        for path in paths:
+            state = self.stat(path)
+            if state != self.state.get(path):
+                changed.add(path)
+                if state is None:
+                    self.state.pop(path, None)
+                else:
+                    self.state[path] = state
+        return changed
+
+    @abstractmethod
+    def events(self, timeout: Optional[float]) -> set[str]:
+        """Returns the paths that may have changed within `timeout` seconds."""
+
+    def wait(self) -> set[str]:
+        """Blocks until files change and returns them.
+
+        Changes are collected until none arrive for `debounce` seconds, so a
+        burst of saves results in a single rebuild.
+        """
+        changed = set()
+        while not changed:
+            changed = self.update(self.events(None))
+        while more := self.update(self.events(self.debounce)):
+            changed |= more
+        return changed
+
+
+class PollingWatcher(Watcher):
+    name = "polling"
+
+    def __init__(self, *args, interval: float = 0.5, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interval = interval
+
+    def events(self, timeout: Optional[float]) -> set[str]:
+        time.sleep(self.interval if timeout is None else timeout)
+        return set(self.scan(self.dir_path)) | set(self.state)
+
+
+class InotifyWatcher(Watcher):
+    name = "inotify"
+
+    def __init__(self, *args, **kwargs):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: dict[int, str] = dict()
+        super().__init__(*args, **kwargs)
+        self.add_watches(self.dir_path)
+
+    def add_watches(self, dir_path: str):
+        for root, dirs, _ in os.walk(dir_path):
+            dirs[:] = [
+                d for d in dirs if not self.is_ignored(os.path.join(root, d), True)
+            ]
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, f"Cannot watch {root}: {os.strerror(errno)}")
+            self.watches[wd] = root
+
+    def read(self) -> bytes:
+        data = b""
+        while True:
+            try:
+                chunk = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return data
+            if not chunk:
+                return data
+            data += chunk
+
+    def events(self, timeout: Optional[float]) -> set[str]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        data = self.read()
+        paths = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, fall back to comparing every file.
+                return set(self.scan(self.dir_path)) | set(self.state)
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            if wd not in self.watches:
+                continue
+
+            path = os.path.join(self.watches[wd], name)
+            if mask & IN_ISDIR:
+                if self.is_ignored(path, True):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_watches(path)
+                    paths.update(self.scan(path))
+                else:
+                    paths.update(p for p in self.state if p.startswith(path + os.sep))
+            elif not self.is_ignored(path):
+                paths.add(path)
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(
+    dir_path: str,
+    spec: Optional[pathspec.PathSpec] = None,
+    debounce: float = 0.05,
+    poll: bool = False,
+) -> Watcher:
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(dir_path, spec, debounce)
+        except (AttributeError, OSError) as e:
+            print("Falling back to polling:", e)
+    return PollingWatcher(dir_path, spec, debounce)
+
+
+def local_modules(dir_path: str) -> dict[str, str]:
+    """Returns the imported modules that live in `dir_path` by file."""
+    modules = dict()
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if not file:
+            continue
+        file = os.path.abspath(file)
+        if file.startswith(dir_path + os.sep) and "site-packages" not in file:
+            modules[name] = file
+    return modules
+
+
+def run_warm(conn, file_path: str, args: list[str]):
+    """Runs `file_path` as `__main__` each time changed paths are received.
+
+    Third-party imports, registered fonts and cached data stay loaded between
+    runs. Once one of the local modules changes, all of them are unloaded so
+    that `from ... import` bindings are refreshed too.
+    """
+    dir_path = os.path.abspath(os.path.dirname(file_path))
+    sys.path.insert(0, dir_path)
+    sys.argv = [file_path, *args]
+
+    # Set once for the worker's lifetime, the re-imported modules leave
+    # reportlab's configuration alone.
+    from cv_generator.main import use_binary_streams
+
+    use_binary_streams()
+
+    while True:
+        try:
+            changed = conn.recv()
+        except EOFError:
+            return
+
+        modules = local_modules(dir_path)
+        if any(file in changed for file in modules.values()):
+            for name in modules:
+                del sys.modules[name]
+
+        start = time.perf_counter()
+        try:
+            runpy.run_path(file_path, run_name="__main__")
+        except SystemExit as e:
+            if e.code:
+                print("Exited with:", e.code)
+        except Exception:
+            traceback.print_exc()
+        conn.send(time.perf_counter() - start)
+
+
+class WarmWorker:
+    """A long-lived process that re-runs the script in place with `run_warm`."""
+
+    def __init__(self, file_path: str, args: list[str]):
+        self.file_path = file_path
+        self.args = args
+        self.process = None
+        self.conn = None
+
+    def start(self):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=run_warm,
+            args=(child_conn, self.file_path, self.args),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def run(self, changed: set[str]):
+        if self.process is None or not self.process.is_alive():
+            self.start()
+        self.conn.send(changed)
+        try:
+            print(f"Rendered in {self.conn.recv() * 1000:.0f} ms")
+        except EOFError:
+            print("Worker exited with:", self.process.exitcode)
+            self.process = None
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: hot_reload.py <file> <args>")
+        print(
+            "Usage: hot_reload.py <file> [--ignore-file=<file>] [--poll] [--debounce=<ms>] [--warm] <args>"
+        )
         sys.exit(1)
 
     args = sys.argv[1:]
@@ -20,45 +314,42 @@ if __name__ == "__main__":
 
     dir_path = os.path.abspath(os.path.dirname(file_path))
 
-    spec: pathspec.PathSpec = None
-
-    ignore_file = ".cvignore" if os.path.exists(os.path.join(dir_path, ".cvignore")) else ".gitignore"
-    for idx, arg in enumerate(args):
+    ignore_file = (
+        ".cvignore"
+        if os.path.exists(os.path.join(dir_path, ".cvignore"))
+        else ".gitignore"
+    )
+    poll = False
+    warm = False
+    debounce = 0.05
+    for arg in list(args):
         if arg.startswith("--ignore-file="):
             ignore_file = "=".join(arg.split("=")[1:])
-            args.pop(idx)
-            break
-
-    spec: Optional[pathspec.PathSpec] = None
-    if os.path.exists(os.path.join(dir_path, ignore_file)):
-        spec = pathspec.PathSpec.from_lines(
-            pathspec.patterns.GitWildMatchPattern,
-            open(os.path.join(dir_path, ignore_file)),
-        )
+        elif arg == "--poll":
+            poll = True
+        elif arg == "--warm":
+            warm = True
+        elif arg.startswith("--debounce="):
+            debounce = float(arg.split("=")[1]) / 1000
+        else:
+            continue
+        args.remove(arg)
 
-    last_mtime: float = None
-    while True:
-        should_reload = False
-        for root, dirs, files in os.walk(dir_path):
-            for f in files:
-                if os.path.join(root, f) == os.path.abspath(__file__):
-                    continue
-                if spec and spec.match_file(
-                    os.path.relpath(os.path.join(root, f), dir_path)
-                ):
-                    continue
-                mtime = os.stat(os.path.join(root, f)).st_mtime
-                if last_mtime is None:
-                    last_mtime = mtime
-                    should_reload = True
-                elif mtime > last_mtime:
-                    print("Reloading:", f)
-                    last_mtime = mtime
-                    should_reload = True
-                if should_reload:
-                    break
-            if should_reload:
-                break
-        if should_reload:
-            subprocess.call([sys.executable, file_path, *args])
-        time.sleep(0.5)
+    watcher = create_watcher(dir_path, load_spec(dir_path, ignore_file), debounce, poll)
+    print(f"Watching {dir_path} ({watcher.name})")
+
+    if warm:
+        worker = WarmWorker(file_path, args)
+        rebuild = worker.run
+    else:
+        rebuild = lambda _: subprocess.call([sys.executable, file_path, *args])
+
+    try:
+        rebuild(set())
+        while True:
+            changed = watcher.wait()
+            for path in sorted(changed):
+                print("Reloading:", os.path.relpath(path, dir_path))
+            rebuild(changed)
+    except KeyboardInterrupt:
+        pass
@@ -1,8 +1,8 @@
 import argparse
+import json
+import logging
 import os
 
-from cv_generator import generate_cv
-
 parser = argparse.ArgumentParser(description="Generate a CV from a template.")
 parser.add_argument(
     "data", nargs="?", default="./assets/cv.json", help="The data file to use."
@@ -15,7 +15,31 @@ parser.add_argument(
 )
 parser.add_argument("--filename", "-f", dest="filename", help="The filename to use.")
 parser.add_argument(
-    "--lang", "-l", dest="lang", default="en", help="Language of the CV."
+    "--lang",
+    "-l",
+    dest="lang",
+    default="en",
+    help="Language of the CV, or a comma separated list of languages.",
+)
+parser.add_argument(
+    "--font",
+    dest="font",
+    default="SourceSansPro-Regular",
+    help="Name of a font in assets/Source_Sans_Pro or path to a TTF file.",
+)
+parser.add_argument(
+    "--catalog",
+    dest="catalogs",
+    action="append",
+    default=[],
+    help="JSON file with additional or overridden strings, can be repeated.",
+)
+parser.add_argument(
+    "--dpi",
+    dest="dpi",
+    type=int,
+    default=300,
+    help="Resolution the portrait is embedded at.",
 )
 parser.add_argument(
     "--hide-watermark",
@@ -24,23 +48,82 @@ parser.add_argument(
     action="store_false",
     help="Hide the watermark.",
 )
+parser.add_argument(
+    "--repeat-sidebar",
+    dest="repeat_sidebar",
+    action="store_true",
+    help="Repeat the whole sidebar on every page instead of continuing it.",
+)
+parser.add_argument(
+    "--subset-font",
+    dest="subset_font",
+    action="store_true",
+    help="Embed only the glyphs used from the TrueType font for a smaller file.",
+)
+parser.add_argument(
+    "--no-compression",
+    dest="page_compression",
+    action="store_false",
+    help="Don't compress the page streams, e.g. to inspect the PDF.",
+)
+parser.add_argument(
+    "--template",
+    dest="template",
+    help="JSON layout template to use, defaults to assets/templates/default.json.",
+)
+parser.add_argument(
+    "--deterministic",
+    dest="deterministic",
+    action="store_true",
+    help="Produce the same bytes for the same inputs, dates come from SOURCE_DATE_EPOCH if set.",
+)
+parser.add_argument(
+    "--build-manifest",
+    dest="build_manifest",
+    help="Directory to record the inputs of rendered CVs in, CVs whose inputs are unchanged are skipped.",
+)
+parser.add_argument(
+    "--cache-dir",
+    dest="cache_dir",
+    help="Directory for converted fonts and prepared images, defaults to $CV_GENERATOR_CACHE or __cache__.",
+)
+parser.add_argument(
+    "--profile",
+    nargs="?",
+    const="-",
+    help="Write a JSON breakdown of the time spent in each phase to this file, or print it.",
+)
+parser.add_argument(
+    "--profile-stats",
+    dest="profile_stats",
+    help="Write cProfile stats to this file, implies --profile.",
+)
+parser.add_argument(
+    "--profile-memory",
+    dest="profile_memory",
+    action="store_true",
+    help="Include the peak memory traced by tracemalloc, implies --profile.",
+)
 
 if __name__ == "__main__":
     args = parser.parse_args()
 
-    if not os.path.exists("__cache__"):
-        os.mkdir("__cache__")
-    if not os.path.exists(os.path.join("__cache__", "fonts")):
-        os.mkdir(os.path.join("__cache__", "fonts"))
-    if not os.path.exists(os.path.join("__cache__", "images")):
-        os.mkdir(os.path.join("__cache__", "images"))
+    # Imported once the arguments are valid, so --help and usage errors don't
+    # wait for reportlab to load.
+    from cv_generator import Profiler, generate_cv
+    from cv_generator.main import use_binary_streams
+    from cv_generator.util.file_cache import set_cache_root
+    from cv_generator.util.i18n import load_catalog
 
-    """ # Convert TTF to AFM/PFB
-    font = TTFont(
-        os.path.join("assets", "Source_Sans_Pro", "SourceSansPro-Regular.ttf")
-    )
-    font.save(os.path.join("__cache__", "fonts", "SourceSansPro-Regular.afm"))
-    font.save(os.path.join("__cache__", "fonts", "SourceSansPro-Regular.pfb")) """
+    use_binary_streams()
+
+    for catalog_path in args.catalogs:
+        load_catalog(catalog_path)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.cache_dir:
+        set_cache_root(args.cache_dir)
 
     """ print(
         args.lang,
@@ -48,10 +131,36 @@ if __name__ == "__main__":
         args.filename,
     ) """
 
+    langs = args.lang.split(",")
+
+    profile = None
+    if args.profile or args.profile_stats or args.profile_memory:
+        profile = Profiler(
+            cprofile=bool(args.profile_stats), memory=args.profile_memory
+        )
+
     generate_cv(
         args.data or os.path.join("assets", "cv.json"),
-        ("SourceSansPro-Regular.afm", "SourceSansPro-Regular.pfb"),
-        args.lang,
+        args.font,
+        langs[0] if len(langs) == 1 else langs,
         args.title,
         args.filename if args.filename else args.title + ".pdf" if args.title else None,
+        include_watermark=args.watermark,
+        image_dpi=args.dpi,
+        profile=profile,
+        subset_font=args.subset_font,
+        page_compression=args.page_compression,
+        repeat_sidebar=args.repeat_sidebar,
+        deterministic=args.deterministic,
+        build_manifest=args.build_manifest,
+        template=args.template,
     )
+
+    if profile:
+        if args.profile and args.profile != "-":
+            with open(args.profile, "w", encoding="utf8") as f:
+                json.dump(profile.to_dict(), f, indent=2)
+        else:
+            print(json.dumps(profile.to_dict(), indent=2))
+        if args.profile_stats:
+            profile.dump_stats(args.profile_stats)
@@ -0,0 +1,47 @@
+import asyncio
+import os
+
+from benchmarks.synthetic import write_cv
+from cv_generator.aio import generate_cv_async, generate_cvs_async
+
+
+async def collect(results) -> list:
+    return [result async for result in results]
+
+
+def test_same_filenames_dont_overwrite(tmp_path):
+    data_paths = [
+        write_cv(str(tmp_path / name), portrait=64) for name in ("a", "b", "c")
+    ]
+    output_path = tmp_path / "out"
+    output_path.mkdir()
+
+    results = asyncio.run(
+        collect(
+            generate_cvs_async(
+                data_paths, "SourceSansPro-Regular", output_path=str(output_path)
+            )
+        )
+    )
+
+    filenames = {result.filename for result in results}
+    assert all(result.ok for result in results)
+    assert len(filenames) == len(data_paths)
+    assert sorted(os.listdir(output_path)) == sorted(filenames)
+
+
+def test_deterministic_date(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    data_path = write_cv(str(tmp_path / "data"), portrait=64)
+
+    filename = asyncio.run(
+        generate_cv_async(
+            data_path,
+            "SourceSansPro-Regular",
+            output_path=str(tmp_path),
+            deterministic=True,
+        )
+    )
+
+    assert filename.startswith("2023_11_14_")
+    assert os.path.exists(tmp_path / filename)
@@ -0,0 +1,68 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from benchmarks.synthetic import write_cv
+from cv_generator import batch, main
+from cv_generator.batch import generate_cvs
+
+
+def set_today(monkeypatch, today: datetime):
+    class Today(datetime):
+        @classmethod
+        def today(cls):
+            return today
+
+    monkeypatch.setattr(main, "datetime", Today)
+    monkeypatch.setattr(batch, "datetime", Today)
+
+
+@pytest.fixture
+def data_paths(tmp_path):
+    return [write_cv(str(tmp_path / name), portrait=64) for name in ("a", "b", "c")]
+
+
+def run(data_paths: list[str], output_path: str, build_manifest: str) -> dict:
+    results = list(
+        generate_cvs(
+            data_paths,
+            "SourceSansPro-Regular",
+            output_path=output_path,
+            max_workers=1,
+            build_manifest=build_manifest,
+        )
+    )
+    assert all(result.ok for result in results)
+    return {result.data_path: result.filename for result in results}
+
+
+def test_same_filenames_dont_overwrite(tmp_path, data_paths):
+    output_path = tmp_path / "out"
+    output_path.mkdir()
+
+    for _ in range(2):
+        filenames = run(data_paths, str(output_path), str(tmp_path / "manifest"))
+        assert len(set(filenames.values())) == len(data_paths)
+        assert sorted(os.listdir(output_path)) == sorted(filenames.values())
+
+
+def test_unchanged_cvs_skipped_on_another_day(tmp_path, monkeypatch, data_paths):
+    output_path = tmp_path / "out"
+    output_path.mkdir()
+    manifest = str(tmp_path / "manifest")
+
+    set_today(monkeypatch, datetime(2026, 10, 18))
+    first = run(data_paths, str(output_path), manifest)
+    mtimes = {name: os.stat(output_path / name).st_mtime_ns for name in first.values()}
+
+    # Adding a file that shares the name doesn't rename the others either.
+    data_paths.append(write_cv(str(tmp_path / "d"), portrait=64))
+    set_today(monkeypatch, datetime(2026, 10, 19))
+    second = run(data_paths, str(output_path), manifest)
+
+    assert {path: second[path] for path in first} == first
+    for name in first.values():
+        assert os.stat(output_path / name).st_mtime_ns == mtimes[name]
+    assert second[data_paths[-1]].startswith("d_")
+    assert "2026_10_19" in second[data_paths[-1]]
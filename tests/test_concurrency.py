@@ -0,0 +1,31 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.stress import stress
+from benchmarks.synthetic import write_cv
+from cv_generator.util import file_cache
+from cv_generator.util.file_cache import set_cache_root
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(file_cache.CACHE_ROOT_ENV, file_cache.cache_root)
+    previous = file_cache.cache_root
+    set_cache_root(str(tmp_path / "cache"))
+    yield tmp_path / "cache"
+    set_cache_root(previous)
+
+
+@pytest.mark.parametrize("executor_type", [ProcessPoolExecutor, ThreadPoolExecutor])
+def test_concurrent_renders(tmp_path, cache_dir, executor_type):
+    data_path = write_cv(str(tmp_path / "data"), portrait=64)
+
+    with executor_type(max_workers=4) as executor:
+        errors = stress(
+            executor, str(tmp_path / "out"), data_path, "SourceSansPro-Regular", 8
+        )
+
+    assert errors == []
+    assert not list(cache_dir.glob("**/*.tmp"))
@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+
+import pytest
+
+from benchmarks.synthetic import write_cv
+from cv_generator.server import RenderServer
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    return write_cv(str(tmp_path / "data"), portrait=64, experience=12)
+
+
+@pytest.fixture
+def server(data_path):
+    server = RenderServer(
+        ("127.0.0.1", 0),
+        "SourceSansPro-Regular",
+        os.path.dirname(data_path),
+        max_workers=1,
+        max_pending=0,
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def post(server: RenderServer, body) -> tuple[int, bytes]:
+    connection = HTTPConnection(*server.server_address, timeout=30)
+    try:
+        connection.request("POST", "/render", json.dumps(body))
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def load(data_path: str) -> dict:
+    with open(data_path, encoding="utf8") as f:
+        return json.load(f)
+
+
+def test_render(server, data_path):
+    status, body = post(server, load(data_path))
+    assert status == 200
+    assert body.startswith(b"%PDF")
+
+
+def test_body_not_an_object(server):
+    status, _ = post(server, [1])
+    assert status == 400
+
+
+def test_image_outside_data_dir(server, data_path):
+    data = load(data_path)
+    data["img"] = os.path.join("..", "..", "portrait.png")
+    status, _ = post(server, data)
+    assert status == 400
+
+
+def test_busy(server, data_path):
+    data = load(data_path)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        statuses = [
+            status for status, _ in executor.map(post, [server] * 4, [data] * 4)
+        ]
+    assert 200 in statuses
+    assert 503 in statuses
+    assert set(statuses) <= {200, 503}
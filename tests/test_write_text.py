@@ -0,0 +1,35 @@
+import io
+import re
+from itertools import groupby
+
+from reportlab.pdfgen import canvas
+
+from cv_generator.draw.write_text import write_text
+from cv_generator.util.fonts import register_font
+
+
+def render_text(text: str, style: dict) -> bytes:
+    """Writes `text` on an uncompressed page and returns the PDF."""
+    output = io.BytesIO()
+    doc = canvas.Canvas(output, pageCompression=0, invariant=1)
+    face_name = register_font("SourceSansPro-Regular")
+    text_object = doc.beginText(50, 700)
+    write_text(text_object, text, face_name, 20, max_width=500, style=style)
+    doc.drawText(text_object)
+    doc.showPage()
+    doc.save()
+    return output.getvalue()
+
+
+def test_small_caps_writes_runs():
+    text = "Work Experience and Education"
+    pdf = render_text(text, {"small-caps": True})
+
+    runs = len(list(groupby(text, key=lambda char: char.upper() == char)))
+    fonts = len(re.findall(rb" Tf\b", pdf))
+    strings = len(re.findall(rb"\) Tj\b", pdf))
+    # One string per run of the same case, the font is set once up front and
+    # switched at most once per run.
+    assert strings == runs
+    assert fonts <= runs + 1
+    assert fonts + strings < len(text)